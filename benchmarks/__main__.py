@@ -0,0 +1,118 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+
+from . import client
+
+
+# metrics compared between runs, and whether a larger value is better
+METRICS = [
+    ('calls_per_second', True),
+    ('latency_p50_ms', False),
+    ('latency_p95_ms', False),
+    ('latency_p99_ms', False),
+    ('cpu_ms_per_call', False),
+    ('peak_bytes_per_call', False),
+]
+
+
+def _revision():
+
+    try:
+        return subprocess.check_output(
+            ['git', 'describe', '--always', '--dirty'],
+            stderr=subprocess.DEVNULL, universal_newlines=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current, threshold, out):
+
+    # returns the names of the metrics which got worse by more than
+    # `threshold`, a fraction, writing a table of every change to `out`
+    regressions = []
+
+    if baseline.get('parameters') != current.get('parameters'):
+        out.write('warning: comparing runs with different parameters, {} and {}\n'.format(
+            baseline.get('parameters'), current.get('parameters')))
+
+    for name, result in sorted(current['results'].items()):
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+
+        for metric, higher_is_better in METRICS:
+            if not base.get(metric) or metric not in result:
+                continue
+
+            change = (result[metric] - base[metric]) / base[metric]
+            regressed = -change > threshold if higher_is_better else change > threshold
+            if regressed:
+                regressions.append('{}.{}'.format(name, metric))
+
+            out.write('{:<32} {:<22} {:>12.3f} {:>12.3f} {:>+8.1%}{}\n'.format(
+                name, metric, base[metric], result[metric], change,
+                '  REGRESSION' if regressed else ''))
+
+    return regressions
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument(
+        '--calls', type=int, default=1000,
+        help='api operations per case; bulk cases make fewer, larger calls')
+    parser.add_argument(
+        '--threads', type=int, default=1, help='threads sharing the client')
+    parser.add_argument(
+        '--latency', type=float, default=0,
+        help='seconds the fake server takes to answer each request')
+    parser.add_argument(
+        '--case', action='append', dest='cases',
+        choices=[name for name, _, _ in client.CASES],
+        help='only run this case (may be given more than once)')
+    parser.add_argument('--output', help='file to write the results to, as json')
+    parser.add_argument('--compare', help='json results of an earlier run to compare with')
+    parser.add_argument(
+        '--threshold', type=float, default=0.1,
+        help='fractional change counted as a regression (default: 0.1)')
+
+    args = parser.parse_args(argv)
+
+    results = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'revision': _revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': {
+            'calls': args.calls, 'threads': args.threads, 'latency': args.latency
+        },
+        'results': client.run(
+            args.calls, args.threads, args.latency, args.cases, out=sys.stderr)
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    else:
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write('\n')
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, results, args.threshold, sys.stderr)
+        if regressions:
+            sys.stderr.write('{} regressions: {}\n'.format(
+                len(regressions), ', '.join(regressions)))
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,234 @@
+import gc
+import itertools
+import math
+import multiprocessing
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from mailchimpy.fakeserver import FakeMailChimpServer
+from mailchimpy.mailchimpy import MailChimpClient
+
+
+LIST_ID = 'benchmark'
+
+# members subscribed before the benchmarks run, for the cases which read
+# or change existing members
+SEED_MEMBERS = 1000
+
+
+def _serve(connection, latency, max_connections):
+
+    # run in a separate process, so that the server's work isn't counted
+    # against the client's cpu time and allocations
+    server = FakeMailChimpServer(latency=latency or None, max_connections=max_connections)
+    server.start()
+    connection.send(server.api_root)
+    connection.recv()
+    server.stop()
+
+
+class ServerProcess(object):
+
+    def __init__(self, latency=0, max_connections=1000):
+
+        self.latency = latency
+        self.max_connections = max_connections
+
+    def __enter__(self):
+
+        self._connection, child_connection = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_serve, args=(child_connection, self.latency, self.max_connections),
+            daemon=True)
+        self._process.start()
+        self.api_root = self._connection.recv()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        self._connection.send('stop')
+        self._process.join(5)
+
+
+def _emails(prefix):
+
+    # new addresses for the cases which create members. next() on a count
+    # is safe across threads, unlike on a generator
+    ids = itertools.count()
+    return lambda: '{}-{}@example.com'.format(prefix, next(ids))
+
+
+def _seeded(i):
+
+    return 'seed-{}@example.com'.format(i % SEED_MEMBERS)
+
+
+# each case is (name, calls made per measured call, function making the
+# call). the function takes the client and the number of the call
+
+def _check_subscription_status(client, i):
+
+    client.check_subscription_status(_seeded(i), LIST_ID)
+
+
+def _subscribe_email_to_list(client, i, emails=_emails('subscribe')):
+
+    client.subscribe_email_to_list(emails(), LIST_ID)
+
+
+def _unsubscribe_email_from_list(client, i):
+
+    client.unsubscribe_email_from_list(_seeded(i), LIST_ID)
+
+
+def _set_subscription(client, i):
+
+    client.set_subscription(_seeded(i), LIST_ID, MailChimpClient.MEMBER_STATUS.SUBSCRIBED)
+
+
+def _subscribe_emails_to_list(client, i, emails=_emails('bulk')):
+
+    client.subscribe_emails_to_list([emails() for _ in range(500)], LIST_ID)
+
+
+def _check_subscription_status_many(client, i):
+
+    client.check_subscription_status_many(
+        [_seeded(i * 100 + j) for j in range(100)], LIST_ID)
+
+
+def _iter_list_members(client, i):
+
+    for _ in client.iter_list_members(LIST_ID, page_size=250):
+        pass
+
+
+CASES = [
+    ('check_subscription_status', 1, _check_subscription_status),
+    ('subscribe_email_to_list', 1, _subscribe_email_to_list),
+    ('unsubscribe_email_from_list', 1, _unsubscribe_email_from_list),
+    ('set_subscription', 1, _set_subscription),
+    ('subscribe_emails_to_list', 500, _subscribe_emails_to_list),
+    ('check_subscription_status_many', 100, _check_subscription_status_many),
+    ('iter_list_members', SEED_MEMBERS, _iter_list_members),
+]
+
+
+def percentile(values, p):
+
+    # nearest rank, on already sorted values
+    return values[max(int(math.ceil(p / 100.0 * len(values))) - 1, 0)]
+
+
+def _timed_calls(client, fn, calls, threads):
+
+    latencies = []
+    lock = threading.Lock()
+    counter = itertools.count()
+
+    def worker():
+        while True:
+            i = next(counter)
+            if i >= calls:
+                return
+            started = time.perf_counter()
+            fn(client, i)
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+
+    with ThreadPoolExecutor(threads) as executor:
+        for future in [executor.submit(worker) for _ in range(threads)]:
+            future.result()
+
+    return latencies
+
+
+def _allocations(client, fn, calls):
+
+    # a separate, single threaded pass, since tracing slows everything
+    # down. reports the peak memory allocated during a call and the
+    # blocks still allocated after it, averaged over the calls
+    peaks = []
+
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    try:
+        for i in range(calls):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            fn(client, i)
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+    gc.collect()
+
+    return {
+        'peak_bytes_per_call': sum(peaks) / len(peaks),
+        'retained_blocks_per_call': (sys.getallocatedblocks() - blocks) / calls
+    }
+
+
+def run_case(client, fn, calls, threads=1, warmup=10, allocation_calls=20):
+
+    for i in range(warmup):
+        fn(client, i)
+
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    latencies = sorted(_timed_calls(client, fn, calls, threads))
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+
+    result = {
+        'calls': calls,
+        'threads': threads,
+        'calls_per_second': calls / wall,
+        'latency_p50_ms': percentile(latencies, 50) * 1000,
+        'latency_p95_ms': percentile(latencies, 95) * 1000,
+        'latency_p99_ms': percentile(latencies, 99) * 1000,
+        'cpu_ms_per_call': cpu / calls * 1000
+    }
+
+    if allocation_calls:
+        result.update(_allocations(client, fn, allocation_calls))
+
+    return result
+
+
+def run(calls=1000, threads=1, latency=0, cases=None, out=None):
+
+    results = {}
+
+    with ServerProcess(latency) as server:
+
+        client = MailChimpClient(
+            'benchmark-us1', api_root=server.api_root,
+            pool_maxsize=max(threads, 10))
+        client.subscribe_emails_to_list(
+            [_seeded(i) for i in range(SEED_MEMBERS)], LIST_ID)
+
+        for name, operations, fn in CASES:
+            if cases and name not in cases:
+                continue
+
+            # bulk calls each do the work of many single calls, so fewer
+            # of them are made
+            case_calls = max(calls // operations, 10)
+            result = run_case(client, fn, case_calls, threads)
+            result['operations_per_call'] = operations
+            results[name] = result
+
+            if out is not None:
+                out.write('{:<32} {:>9.1f} calls/s  p50 {:>7.2f}ms  p95 {:>7.2f}ms  '
+                          'p99 {:>7.2f}ms  cpu {:>6.3f}ms\n'.format(
+                              name, result['calls_per_second'], result['latency_p50_ms'],
+                              result['latency_p95_ms'], result['latency_p99_ms'],
+                              result['cpu_ms_per_call']))
+                out.flush()
+
+    return results
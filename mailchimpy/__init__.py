@@ -1 +1,19 @@
 from .mailchimpy import MailChimpClient
+from .batch import BatchJob, BatchResult
+from .cache import SubscriptionCache
+from .fakeserver import FakeMailChimpServer
+from .governor import ConcurrencyGovernor
+from .interests import InterestIndex
+from .metrics import RequestHooks, RequestMetrics
+from .mirror import ListMirror
+from .outbox import Outbox
+from .retry import RetryPolicy
+from .snapshot import Snapshot, build_snapshot, write_snapshot
+from .webhooks import AsyncWebhookApp, StatusTable, WebhookApp
+from .writebehind import WriteBehindQueue
+
+try:
+    from .asyncclient import AsyncMailChimpClient
+except ImportError:
+    # aiohttp is only required by the async client
+    pass
@@ -0,0 +1,103 @@
+import argparse
+import os
+import sys
+
+from .mailchimpy import MailChimpClient
+from .exporter import export_members
+from .importer import import_emails
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(prog='python -m mailchimpy')
+    parser.add_argument(
+        '--api-key', default=os.environ.get('MAILCHIMP_API_KEY'),
+        help='MailChimp api key (default: $MAILCHIMP_API_KEY)')
+    subparsers = parser.add_subparsers(dest='command')
+
+    import_parser = subparsers.add_parser(
+        'import', help='subscribe every email in a csv or ndjson file to a list')
+    import_parser.add_argument('path', help='csv or ndjson file of contacts')
+    import_parser.add_argument('--list', required=True, dest='list_id')
+    import_parser.add_argument(
+        '--format', choices=['csv', 'ndjson'], dest='input_format',
+        help='input format (default: guessed from the file extension)')
+    import_parser.add_argument(
+        '--column', default='email', help='field holding the email address')
+    import_parser.add_argument(
+        '--chunk-size', type=int, default=500, help='emails per api request')
+    import_parser.add_argument(
+        '--parallel', type=int, default=4, help='api requests in flight at once')
+    import_parser.add_argument(
+        '--processes', type=int, help='worker processes normalizing emails')
+    import_parser.add_argument(
+        '--checkpoint', dest='checkpoint_path',
+        help='file recording progress, to resume an interrupted import from')
+    import_parser.add_argument(
+        '--dedupe-capacity', type=int, default=1000000,
+        help='most distinct emails remembered when removing duplicates')
+    import_parser.add_argument(
+        '--update-existing', action='store_true',
+        help='subscribe existing members again, including any who have unsubscribed')
+
+    export_parser = subparsers.add_parser(
+        'export', help='write every member of a list to a csv or ndjson file')
+    export_parser.add_argument('--list', required=True, dest='list_id')
+    export_parser.add_argument(
+        '--format', choices=['csv', 'ndjson'], default='ndjson', dest='output_format')
+    export_parser.add_argument(
+        '--output', help='file to write to (default: stdout)')
+    export_parser.add_argument(
+        '--fields', type=lambda fields: fields.split(','),
+        help='comma separated member fields to export, e.g. email_address,status')
+    export_parser.add_argument(
+        '--status', help='only export members with this status')
+    export_parser.add_argument(
+        '--page-size', type=int, default=1000, help='members per api request')
+    export_parser.add_argument(
+        '--concurrency', type=int, default=10, help='api requests in flight at once')
+
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        parser.print_help()
+        return 2
+
+    if not args.api_key:
+        parser.error('an api key is required, via --api-key or $MAILCHIMP_API_KEY')
+
+    if args.command == 'import':
+        client = MailChimpClient(args.api_key, pool_maxsize=args.parallel)
+        stats = import_emails(
+            client, args.list_id, args.path,
+            input_format=args.input_format,
+            column=args.column,
+            chunk_size=args.chunk_size,
+            parallel=args.parallel,
+            processes=args.processes,
+            checkpoint_path=args.checkpoint_path,
+            dedupe_capacity=args.dedupe_capacity,
+            update_existing=args.update_existing
+        )
+        return 1 if stats['errors'] else 0
+
+    if args.command == 'export':
+        client = MailChimpClient(args.api_key, pool_maxsize=args.concurrency)
+        out = open(args.output, 'w', newline='') if args.output else sys.stdout
+        try:
+            export_members(
+                client, args.list_id, out,
+                output_format=args.output_format,
+                fields=args.fields,
+                status=args.status,
+                page_size=args.page_size,
+                concurrency=args.concurrency
+            )
+        finally:
+            if args.output:
+                out.close()
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,140 @@
+import aiohttp
+
+from .mailchimpy import (
+    MailChimpClient, _projection, _subscriber_hash, _subscription_status)
+
+
+class AsyncMailChimpClient(object):
+
+    MEMBER_STATUS = MailChimpClient.MEMBER_STATUS
+
+    def __init__(self, api_key, max_connections=100, api_root=None):
+
+        self.api_key = api_key
+
+        # the subdomain to use in the api url
+        # is always the last 3 characters of the api key
+        self.subdomain = self.api_key.split('-')[-1]
+
+        # the api can be pointed elsewhere, e.g. at a FakeMailChimpServer
+        self.api_root = api_root or 'https://{}.api.mailchimp.com/3.0/'.format(
+            self.subdomain)
+
+        # the total number of connections the shared pool may hold open.
+        # every coroutine using this client draws from the same pool
+        self.max_connections = max_connections
+
+        # aiohttp sessions must be created from within a running event
+        # loop, so the session is set up lazily on first use
+        self.session = None
+
+    async def __aenter__(self):
+
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+
+        await self.close()
+
+    async def close(self):
+
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _get_session(self):
+
+        if self.session is None:
+            # the Authorization header is built once and sent with every
+            # request, as passing auth= to the session is deprecated
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                headers={'Authorization': aiohttp.encode_basic_auth('apikey', self.api_key)}
+            )
+
+        return self.session
+
+    async def _request(self, method, endpoint, *args, **kwargs):
+
+        # read the body before handing the connection back to the pool, so
+        # that the response can still be inspected once it has been released
+        async with self._get_session().request(
+            method, self.api_root + endpoint.format(*args), **kwargs
+        ) as response:
+            await response.read()
+
+        return response
+
+    async def get_api_root(self, fields=None, exclude_fields=None):
+
+        response = await self._request(
+            'GET', '', params=_projection(fields, exclude_fields))
+
+        return response
+
+    async def check_subscription_status(self, email, list_id, fields=('status',),
+                                        exclude_fields=None):
+
+        email_md5 = _subscriber_hash(email)
+
+        response = await self._request(
+            'GET', 'lists/{}/members/{}', list_id, email_md5,
+            params=_projection(fields, exclude_fields)
+        )
+
+        return _subscription_status(
+            response.status,
+            await response.json() if response.status == 200 else None
+        )
+
+    async def subscribe_email_to_list(self, email, list_id):
+
+        response = await self._request(
+            'POST', 'lists/{}/members', list_id,
+            json={'email_address': email, 'status': 'subscribed'}
+        )
+
+        if response.status == 200:
+            success = True
+        elif response.status == 400:
+            success = False
+        else:
+            success = None
+
+        return success
+
+    async def unsubscribe_email_from_list(self, email, list_id):
+
+        email_md5 = _subscriber_hash(email)
+        response = await self._request(
+            'PATCH', 'lists/{}/members/{}', list_id, email_md5,
+            json={'status': 'unsubscribed'}
+        )
+
+        if response.status == 200:
+            success = True
+        elif response.status == 404:
+            success = None
+        else:
+            success = False
+
+        return success
+
+    async def create_interest_category(self, category_name, list_id):
+
+        response = await self._request(
+            'POST', 'lists/{}/interest-categories', list_id,
+            json={'title': category_name, 'type': 'checkboxes'}
+        )
+
+        return response.status == 200
+
+    async def get_interest_category(self, category_id, list_id, fields=('id',),
+                                    exclude_fields=None):
+
+        response = await self._request(
+            'GET', 'lists/{}/interest-categories/{}', list_id, category_id,
+            params=_projection(fields, exclude_fields)
+        )
+
+        return response.status == 200
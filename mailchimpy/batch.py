@@ -0,0 +1,190 @@
+import json
+import tarfile
+import time
+from collections import namedtuple
+
+
+# the outcome of a single operation within a finished batch. `response` is
+# the decoded JSON body that the operation would have returned on its own
+BatchResult = namedtuple(
+    'BatchResult', ['operation_id', 'status_code', 'response'])
+
+
+class BatchJob(object):
+
+    class STATUS():
+        PENDING = 'pending'
+        PREPROCESSING = 'preprocessing'
+        STARTED = 'started'
+        FINALIZING = 'finalizing'
+        FINISHED = 'finished'
+
+    def __init__(self, client):
+
+        self.client = client
+
+        # operations queued up locally, waiting to be submitted
+        self.operations = []
+
+        # populated once the job has been submitted to the /batches endpoint
+        self.batch_id = None
+        self.status = None
+        self.total_operations = None
+        self.finished_operations = None
+        self.errored_operations = None
+        self.response_body_url = None
+
+    def add_operation(self, method, endpoint, *args, body=None, params=None,
+                      operation_id=None):
+
+        # `endpoint` is a path template, in the same form accepted by
+        # MailChimpClient._request
+        if operation_id is None:
+            operation_id = str(len(self.operations))
+
+        operation = {
+            'method': method,
+            'path': '/' + endpoint.format(*args),
+            'operation_id': operation_id
+        }
+
+        # the batches api expects the body of each operation as a string
+        # of JSON, rather than as a nested object. bodies shared by many
+        # operations may be passed already encoded, to encode them once
+        if body is not None:
+            operation['body'] = body if isinstance(body, str) else json.dumps(body)
+
+        if params is not None:
+            operation['params'] = params
+
+        self.operations.append(operation)
+
+        return operation_id
+
+    def check_subscription_status(self, email, list_id, operation_id=None,
+                                  params=None):
+
+        # only the member's status is needed, unless told otherwise
+        if params is None:
+            params = {'fields': 'status'}
+
+        return self.add_operation(
+            'GET', 'lists/{}/members/{}', list_id, self.client._subscriber_hash(email),
+            params=params, operation_id=operation_id)
+
+    def subscribe_email_to_list(self, email, list_id, operation_id=None):
+
+        return self.add_operation(
+            'POST', 'lists/{}/members', list_id,
+            body={'email_address': email, 'status': 'subscribed'},
+            operation_id=operation_id)
+
+    def unsubscribe_email_from_list(self, email, list_id, operation_id=None):
+
+        return self.add_operation(
+            'PATCH', 'lists/{}/members/{}', list_id, self.client._subscriber_hash(email),
+            body={'status': 'unsubscribed'},
+            operation_id=operation_id)
+
+    def create_interest_category(self, category_name, list_id, operation_id=None):
+
+        return self.add_operation(
+            'POST', 'lists/{}/interest-categories', list_id,
+            body={'title': category_name, 'type': 'checkboxes'},
+            operation_id=operation_id)
+
+    def _update(self, body):
+
+        self.batch_id = body.get('id')
+        self.status = body.get('status')
+        self.total_operations = body.get('total_operations')
+        self.finished_operations = body.get('finished_operations')
+        self.errored_operations = body.get('errored_operations')
+        self.response_body_url = body.get('response_body_url')
+
+    def submit(self):
+
+        if self.batch_id is not None:
+            raise Exception('Batch has already been submitted')
+
+        response = self.client._request(
+            'POST', 'batches', json={'operations': self.operations})
+
+        if response.status_code != 200:
+            raise Exception('Unexpected API response: http status code')
+
+        # the operations now live on MailChimp's side, so there is no need
+        # to keep our own copy of them around
+        self.operations = []
+        self._update(response.json())
+
+        return self.batch_id
+
+    def refresh(self):
+
+        response = self.client._request('GET', 'batches/{}', self.batch_id)
+
+        if response.status_code != 200:
+            raise Exception('Unexpected API response: http status code')
+
+        self._update(response.json())
+
+        return self.status
+
+    def wait(self, poll_interval=1, max_poll_interval=30, timeout=None):
+
+        # poll until the batch is finished, backing off exponentially so
+        # that long-running batches don't cost a request every second
+        started = time.time()
+
+        while self.refresh() != self.STATUS.FINISHED:
+
+            if timeout is not None and time.time() - started + poll_interval > timeout:
+                raise Exception('Timed out waiting for batch to finish')
+
+            time.sleep(poll_interval)
+            poll_interval = min(poll_interval * 2, max_poll_interval)
+
+        return self
+
+    def results(self):
+
+        if self.status != self.STATUS.FINISHED:
+            raise Exception('Batch has not finished yet')
+
+        # the results archive is a pre-signed url, so must be fetched
+        # without our api credentials
+        response = self.client._request(
+            'GET', 'batch-results', url=self.response_body_url, auth=None, stream=True)
+
+        if response.status_code != 200:
+            raise Exception('Unexpected API response: http status code')
+
+        # read the tar.gz as a stream, decoding one results file at a time,
+        # so that the full set of results never needs to be held in memory
+        try:
+            with tarfile.open(fileobj=response.raw, mode='r|gz') as archive:
+                for member in archive:
+
+                    if not member.isfile():
+                        continue
+
+                    results = json.loads(
+                        archive.extractfile(member).read().decode('utf-8'))
+
+                    for result in results:
+                        body = result.get('response')
+                        yield BatchResult(
+                            result.get('operation_id'),
+                            result.get('status_code'),
+                            json.loads(body) if body else None
+                        )
+        finally:
+            response.close()
+
+    def run(self, **wait_kwargs):
+
+        self.submit()
+        self.wait(**wait_kwargs)
+
+        return self.results()
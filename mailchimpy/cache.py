@@ -0,0 +1,74 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class SubscriptionCache(object):
+
+    # returned by get() when there is no fresh entry, since None is itself
+    # a meaningful value for the subscribed half of a status
+    MISSING = object()
+
+    def __init__(self, maxsize=10000, ttl=300):
+
+        # at most `maxsize` entries are kept, each for at most `ttl`
+        # seconds. once full, the least recently used entry is evicted
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # maps key -> (expiry time, value), ordered from least to most
+        # recently used
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+
+        return len(self._entries)
+
+    def get(self, key):
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return self.MISSING
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
@@ -0,0 +1,72 @@
+import csv
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from .mailchimpy import _ordered_map, _projection
+
+
+# csv needs its columns up front, so exports to csv without named fields
+# use these
+DEFAULT_CSV_FIELDS = ('id', 'email_address', 'status')
+
+
+def export_members(client, list_id, out, output_format='ndjson', fields=None,
+                   status=None, page_size=1000, concurrency=10):
+
+    if output_format == 'csv' and fields is None:
+        fields = DEFAULT_CSV_FIELDS
+
+    params = _projection(fields, prefix='members.')
+    if status is not None:
+        params['status'] = status
+
+    # find out how many members there are, so that every page can be
+    # requested at once instead of one after another
+    total_items = client._get_members_page(
+        list_id, 0, 1, dict(params, fields='total_items'))['total_items']
+
+    if fields is not None:
+        params['fields'] = 'total_items,' + params['fields']
+
+    if output_format == 'csv':
+        writer = csv.writer(out)
+        writer.writerow(fields)
+    elif output_format != 'ndjson':
+        raise ValueError('Unknown format: {}'.format(output_format))
+
+    def fetch(offset):
+        return client._get_members_page(list_id, offset, page_size, params)['members']
+
+    exported = 0
+
+    # pages are fetched `concurrency` at a time, and written out in order
+    # as they complete, so at most `concurrency` pages are ever held
+    with ThreadPoolExecutor(concurrency) as executor:
+        for members in _ordered_map(
+                executor, fetch, range(0, total_items, page_size), concurrency):
+
+            for member in members:
+                if output_format == 'csv':
+                    writer.writerow([_csv_value(member, field) for field in fields])
+                else:
+                    out.write(json.dumps(member))
+                    out.write('\n')
+
+            exported += len(members)
+
+    return exported
+
+
+def _csv_value(member, field):
+
+    # fields may name nested values in the same dotted form the api's
+    # projections use, e.g. merge_fields.FNAME
+    value = member
+    for key in field.split('.'):
+        value = value.get(key) if isinstance(value, dict) else None
+
+    # nested values, such as all merge fields, are written as JSON
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+
+    return value
@@ -0,0 +1,606 @@
+import io
+import itertools
+import json
+import math
+import random
+import re
+import sys
+import tarfile
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qsl, urlsplit
+
+from .mailchimpy import _subscriber_hash
+
+
+# latency distributions, each returning a function which gives the delay,
+# in seconds, to add to a request
+
+def constant(seconds):
+
+    return lambda: seconds
+
+
+def uniform(low, high):
+
+    return lambda: random.uniform(low, high)
+
+
+def lognormal(median, sigma):
+
+    # long tailed, like real network latency. `median` is in seconds
+    mu = math.log(median)
+    return lambda: random.lognormvariate(mu, sigma)
+
+
+def _now():
+
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+
+
+def _project(body, fields=None, exclude_fields=None):
+
+    # apply the api's fields / exclude_fields query parameters, which name
+    # dotted paths into the response, descending through lists of objects
+    def select(value, paths):
+        if isinstance(value, list):
+            return [select(item, paths) for item in value]
+        selected = {}
+        for key, rest in _group_paths(paths).items():
+            if key in value:
+                selected[key] = select(value[key], rest) if rest else value[key]
+        return selected
+
+    def exclude(value, paths):
+        if isinstance(value, list):
+            return [exclude(item, paths) for item in value]
+        excluded = dict(value)
+        for key, rest in _group_paths(paths).items():
+            if key in excluded:
+                if rest:
+                    excluded[key] = exclude(excluded[key], rest)
+                else:
+                    del excluded[key]
+        return excluded
+
+    if fields:
+        body = select(body, fields.split(','))
+    if exclude_fields:
+        body = exclude(body, exclude_fields.split(','))
+
+    return body
+
+
+def _group_paths(paths):
+
+    # {'a': ['b', 'c']} from ['a.b', 'a.c'], with an empty list meaning the
+    # whole of 'a' is named
+    grouped = {}
+    for path in paths:
+        key, _, rest = path.partition('.')
+        if rest:
+            if grouped.get(key, None) != []:
+                grouped.setdefault(key, []).append(rest)
+        else:
+            grouped[key] = []
+    return grouped
+
+
+class _Error(Exception):
+
+    def __init__(self, status, title, detail=''):
+
+        self.status = status
+        self.body = {'status': status, 'title': title, 'detail': detail}
+
+
+class FakeMailChimpServer(object):
+
+    # an in-process stand in for the parts of the MailChimp api used by
+    # MailChimpClient, for exercising and measuring the client without the
+    # network. like MailChimp, it turns away requests with a 429 while
+    # more than `max_connections` are in flight
+
+    ROUTES = []
+
+    def __init__(self, latency=None, max_connections=10, error_rate=0.0,
+                 retry_after=None, host='127.0.0.1', port=0):
+
+        # `latency` is None, a number of seconds, or a function returning a
+        # number of seconds, such as those made by uniform() and lognormal()
+        if latency is None or callable(latency):
+            self.latency = latency
+        else:
+            self.latency = constant(latency)
+
+        self.max_connections = max_connections
+
+        # the fraction of requests which fail with a server error
+        self.error_rate = error_rate
+
+        # if set, the seconds throttled and failed requests are told to wait
+        # in a Retry-After header
+        self.retry_after = retry_after
+
+        self.lists = {}
+        self.deleted_lists = set()
+        self.batches = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.faults = 0
+
+        self._httpd = _ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.fake = self
+        self._thread = None
+
+    @property
+    def url(self):
+
+        return 'http://{}:{}/'.format(*self._httpd.server_address[:2])
+
+    @property
+    def api_root(self):
+
+        return self.url + '3.0/'
+
+    def start(self):
+
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        self.stop()
+
+    def stats(self):
+
+        return {
+            'requests': self.requests,
+            'throttled': self.throttled,
+            'faults': self.faults
+        }
+
+    def _next_id(self):
+
+        return '{:010x}'.format(next(self._ids))
+
+    def _list(self, list_id):
+
+        # lists are created on first use, unless they have been deleted
+        if list_id in self.deleted_lists:
+            raise _Error(404, 'Resource Not Found')
+
+        return self.lists.setdefault(list_id, {
+            'members': {}, 'categories': {}, 'segments': {}
+        })
+
+    def delete_list(self, list_id):
+
+        # every later request for the list is answered with a 404
+        with self._lock:
+            self.lists.pop(list_id, None)
+            self.deleted_lists.add(list_id)
+
+    def add_member(self, list_id, email, status='subscribed'):
+
+        with self._lock:
+            return self._put_member(list_id, email, {'status': status})[1]
+
+    def _put_member(self, list_id, email, changes):
+
+        members = self._list(list_id)['members']
+        subscriber_hash = _subscriber_hash(email)
+        member = members.get(subscriber_hash)
+        created = member is None
+
+        if created:
+            member = members[subscriber_hash] = {
+                'id': subscriber_hash,
+                'email_address': email.lower(),
+                'status': 'subscribed',
+                'merge_fields': {},
+                'interests': {},
+                'list_id': list_id
+            }
+
+        for key in ('status', 'merge_fields', 'interests'):
+            if key in changes:
+                if isinstance(member[key], dict):
+                    member[key].update(changes[key])
+                else:
+                    member[key] = changes[key]
+
+        member['last_changed'] = _now()
+
+        return created, member
+
+    # request handling, independent of http so that batches can reuse it
+
+    def handle(self, method, path, query, body):
+
+        for route_method, pattern, handler in self.ROUTES:
+            if route_method != method:
+                continue
+            match = pattern.match(path)
+            if match:
+                try:
+                    with self._lock:
+                        status, response = handler(self, query, body, *match.groups())
+                except _Error as e:
+                    return e.status, e.body
+                if status == 200 and isinstance(response, dict):
+                    response = _project(
+                        response, query.get('fields'), query.get('exclude_fields'))
+                return status, response
+
+        return 404, {'status': 404, 'title': 'Resource Not Found'}
+
+    def route(method, pattern, ROUTES=ROUTES):
+
+        def register(handler):
+            ROUTES.append((method, re.compile('^/3.0/' + pattern + '/?$'), handler))
+            return handler
+
+        return register
+
+    @route('GET', '')
+    def _get_root(self, query, body):
+
+        return 200, {'account_id': 'fake', 'account_name': 'Fake MailChimp'}
+
+    @route('POST', 'lists/([^/]+)')
+    def _batch_subscribe(self, query, body, list_id):
+
+        members = self._list(list_id)['members']
+        new, updated, errors = [], [], []
+
+        for member in body.get('members', []):
+            email = member.get('email_address', '')
+            if '@' not in email:
+                errors.append({'email_address': email, 'error': 'Invalid email'})
+            elif _subscriber_hash(email) in members and not body.get('update_existing'):
+                errors.append({'email_address': email, 'error': 'Member Exists'})
+            else:
+                created, member = self._put_member(list_id, email, member)
+                (new if created else updated).append(member)
+
+        return 200, {
+            'new_members': new, 'updated_members': updated, 'errors': errors,
+            'total_created': len(new), 'total_updated': len(updated),
+            'error_count': len(errors)
+        }
+
+    @route('GET', 'lists/([^/]+)/members')
+    def _get_members(self, query, body, list_id):
+
+        members = list(self._list(list_id)['members'].values())
+
+        if 'status' in query:
+            members = [m for m in members if m['status'] == query['status']]
+        if 'since_last_changed' in query:
+            members = [
+                m for m in members if m['last_changed'] > query['since_last_changed']]
+
+        offset = int(query.get('offset', 0))
+        count = int(query.get('count', 10))
+
+        return 200, {
+            'members': members[offset:offset + count],
+            'total_items': len(members)
+        }
+
+    @route('POST', 'lists/([^/]+)/members')
+    def _post_member(self, query, body, list_id):
+
+        if _subscriber_hash(body.get('email_address', '')) in self._list(list_id)['members']:
+            raise _Error(400, 'Member Exists')
+
+        return 200, self._put_member(list_id, body['email_address'], body)[1]
+
+    @route('GET', 'lists/([^/]+)/members/([0-9a-f]{32})')
+    def _get_member(self, query, body, list_id, subscriber_hash):
+
+        member = self._list(list_id)['members'].get(subscriber_hash)
+
+        if member is None:
+            raise _Error(404, 'Resource Not Found')
+
+        return 200, member
+
+    @route('PATCH', 'lists/([^/]+)/members/([0-9a-f]{32})')
+    def _patch_member(self, query, body, list_id, subscriber_hash):
+
+        member = self._get_member(query, body, list_id, subscriber_hash)[1]
+
+        return 200, self._put_member(list_id, member['email_address'], body)[1]
+
+    @route('PUT', 'lists/([^/]+)/members/([0-9a-f]{32})')
+    def _put_member_route(self, query, body, list_id, subscriber_hash):
+
+        if _subscriber_hash(body.get('email_address', '')) != subscriber_hash:
+            raise _Error(400, 'Invalid Resource')
+
+        changes = dict(body)
+        if subscriber_hash not in self._list(list_id)['members']:
+            changes['status'] = body.get('status_if_new', body.get('status'))
+
+        return 200, self._put_member(list_id, body['email_address'], changes)[1]
+
+    @route('POST', 'lists/([^/]+)/interest-categories')
+    def _post_category(self, query, body, list_id):
+
+        category = {
+            'id': self._next_id(), 'list_id': list_id,
+            'title': body['title'], 'type': body.get('type', 'checkboxes')
+        }
+        self._list(list_id)['categories'][category['id']] = dict(category, interests={})
+
+        return 200, category
+
+    def _category(self, list_id, category_id):
+
+        category = self._list(list_id)['categories'].get(category_id)
+
+        if category is None:
+            raise _Error(404, 'Resource Not Found')
+
+        return category
+
+    @route('GET', 'lists/([^/]+)/interest-categories')
+    def _get_categories(self, query, body, list_id):
+
+        categories = [
+            {key: value for key, value in category.items() if key != 'interests'}
+            for category in self._list(list_id)['categories'].values()
+        ]
+
+        return 200, _page(query, 'categories', categories)
+
+    @route('GET', 'lists/([^/]+)/interest-categories/([^/]+)')
+    def _get_category(self, query, body, list_id, category_id):
+
+        category = self._category(list_id, category_id)
+
+        return 200, {key: value for key, value in category.items() if key != 'interests'}
+
+    @route('POST', 'lists/([^/]+)/interest-categories/([^/]+)/interests')
+    def _post_interest(self, query, body, list_id, category_id):
+
+        interest = {
+            'id': self._next_id(), 'category_id': category_id,
+            'list_id': list_id, 'name': body['name']
+        }
+        self._category(list_id, category_id)['interests'][interest['id']] = interest
+
+        return 200, interest
+
+    @route('GET', 'lists/([^/]+)/interest-categories/([^/]+)/interests')
+    def _get_interests(self, query, body, list_id, category_id):
+
+        interests = list(self._category(list_id, category_id)['interests'].values())
+
+        return 200, _page(query, 'interests', interests)
+
+    @route('GET', 'lists/([^/]+)/segments')
+    def _get_segments(self, query, body, list_id):
+
+        segments = [
+            {'id': segment_id, 'name': segment['name'], 'type': 'static',
+             'member_count': len(segment['members'])}
+            for segment_id, segment in self._list(list_id)['segments'].items()
+        ]
+
+        return 200, _page(query, 'segments', segments)
+
+    @route('POST', 'lists/([^/]+)/segments')
+    def _post_segment(self, query, body, list_id):
+
+        segment_id = next(self._ids)
+        self._list(list_id)['segments'][segment_id] = {
+            'name': body['name'], 'members': set()}
+
+        return 200, {'id': segment_id, 'name': body['name'], 'type': 'static'}
+
+    @route('POST', 'lists/([^/]+)/segments/([0-9]+)')
+    def _update_segment(self, query, body, list_id, segment_id):
+
+        segment = self._list(list_id)['segments'].get(int(segment_id))
+        if segment is None:
+            raise _Error(404, 'Resource Not Found')
+
+        members = self._list(list_id)['members']
+        added, removed, errors = [], [], []
+
+        for action, emails, done in (
+                (segment['members'].add, body.get('members_to_add', []), added),
+                (segment['members'].discard, body.get('members_to_remove', []), removed)):
+            for email in emails:
+                if _subscriber_hash(email) in members:
+                    action(_subscriber_hash(email))
+                    done.append(members[_subscriber_hash(email)])
+                else:
+                    errors.append(email)
+
+        return 200, {
+            'members_added': added, 'members_removed': removed,
+            'errors': [{'email_addresses': errors, 'error': 'Not on list'}] if errors else [],
+            'total_added': len(added), 'total_removed': len(removed),
+            'error_count': len(errors)
+        }
+
+    @route('POST', 'batches')
+    def _post_batch(self, query, body):
+
+        # operations are run straight away, so batches are finished as soon
+        # as they are submitted
+        results = []
+        for operation in body.get('operations', []):
+            status, response = self.handle(
+                operation['method'],
+                '/3.0' + operation['path'],
+                dict(operation.get('params') or {}),
+                json.loads(operation['body']) if operation.get('body') else {}
+            )
+            results.append({
+                'status_code': status,
+                'operation_id': operation.get('operation_id'),
+                'response': json.dumps(response)
+            })
+
+        batch_id = self._next_id()
+        self.batches[batch_id] = _archive(results)
+
+        return 200, {
+            'id': batch_id,
+            'status': 'finished',
+            'total_operations': len(results),
+            'finished_operations': len(results),
+            'errored_operations': len([r for r in results if r['status_code'] != 200]),
+            'response_body_url': '{}batch-results/{}.tar.gz'.format(self.url, batch_id)
+        }
+
+    @route('GET', 'batches/([^/]+)')
+    def _get_batch(self, query, body, batch_id):
+
+        if batch_id not in self.batches:
+            raise _Error(404, 'Resource Not Found')
+
+        return 200, {
+            'id': batch_id,
+            'status': 'finished',
+            'response_body_url': '{}batch-results/{}.tar.gz'.format(self.url, batch_id)
+        }
+
+    del route
+
+
+def _page(query, key, items):
+
+    offset = int(query.get('offset', 0))
+    count = int(query.get('count', 10))
+
+    return {key: items[offset:offset + count], 'total_items': len(items)}
+
+
+def _archive(results):
+
+    data = json.dumps(results).encode()
+    archive = io.BytesIO()
+
+    with tarfile.open(fileobj=archive, mode='w:gz') as tar:
+        info = tarfile.TarInfo('results.json')
+        info.size = len(data)
+        tar.addfile(info, io.BytesIO(data))
+
+    return archive.getvalue()
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+
+    daemon_threads = True
+
+    # the default backlog of 5 turns connections away long before the
+    # fake api gets a chance to
+    request_queue_size = 1024
+
+    def handle_error(self, request, client_address):
+
+        # clients which give up on a slow response, e.g. after a read
+        # timeout, hang up before it is written. that's expected here, so
+        # don't print a traceback for it
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            HTTPServer.handle_error(self, request, client_address)
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    # headers and body are written separately, which with nagle's algorithm
+    # on a keep-alive connection stalls every response on a delayed ack
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+
+        pass
+
+    def _send(self, status, body, content_type='application/json'):
+
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        if status in (429, 503) and self.server.fake.retry_after is not None:
+            self.send_header('Retry-After', str(self.server.fake.retry_after))
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self):
+
+        fake = self.server.fake
+        url = urlsplit(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+
+        with fake._lock:
+            fake.requests += 1
+            fake.in_flight += 1
+            throttled = fake.in_flight > fake.max_connections
+            if throttled:
+                fake.throttled += 1
+
+        try:
+            # throttled requests are turned away straight away, without
+            # holding on to their connection for the simulated latency
+            if throttled:
+                return self._send(429, {
+                    'status': 429, 'title': 'Too Many Requests',
+                    'detail': 'You have exceeded the limit of {} simultaneous '
+                              'connections.'.format(fake.max_connections)})
+
+            if fake.latency is not None:
+                time.sleep(max(fake.latency(), 0))
+
+            if fake.error_rate and random.random() < fake.error_rate:
+                with fake._lock:
+                    fake.faults += 1
+                return self._send(503, {'status': 503, 'title': 'Service Unavailable'})
+
+            match = re.match(r'^/batch-results/([^/]+)\.tar\.gz$', url.path)
+            if match and self.command == 'GET':
+                archive = fake.batches.get(match.group(1))
+                if archive is None:
+                    return self._send(404, {'status': 404, 'title': 'Resource Not Found'})
+                return self._send(200, archive, 'application/x-gzip')
+
+            try:
+                request_body = json.loads(body.decode('utf-8')) if body else {}
+            except ValueError:
+                return self._send(400, {'status': 400, 'title': 'Invalid Resource'})
+
+            self._send(*fake.handle(
+                self.command, url.path, dict(parse_qsl(url.query)), request_body))
+        finally:
+            with fake._lock:
+                fake.in_flight -= 1
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
@@ -0,0 +1,158 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # file locks are only available on unix, so coordinating between
+    # processes is not possible elsewhere
+    fcntl = None
+
+
+class TokenBucket(object):
+
+    def __init__(self, rate, burst=None):
+
+        # `rate` tokens are added per second, up to a maximum of `burst`.
+        # each request takes a whole token, so the bucket must hold at least
+        # one, or slow rates such as one request every two seconds would
+        # never let a request through
+        self.rate = rate
+        self.capacity = max(burst if burst is not None else rate, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+
+        while True:
+
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+
+class ConcurrencyGovernor(object):
+
+    # MailChimp allows each api key at most this many simultaneous
+    # connections, and responds with 429 to any beyond that
+    MAX_CONCURRENT = 10
+
+    def __init__(self, max_concurrent=MAX_CONCURRENT, rate=None, burst=None,
+                 lock_dir=None, api_key=None, poll_interval=0.01):
+
+        self.max_concurrent = max_concurrent
+
+        # caps the number of requests in flight from this process
+        self.semaphore = threading.BoundedSemaphore(max_concurrent)
+
+        # optionally caps the sustained request rate, while still
+        # allowing short bursts
+        self.bucket = TokenBucket(rate, burst) if rate is not None else None
+
+        # when a lock directory is given, requests also need to hold one of
+        # `max_concurrent` lock files, which caps the number of requests in
+        # flight across every process on this host sharing the directory
+        if lock_dir is not None and fcntl is None:
+            raise Exception('Cross-process governing requires fcntl')
+
+        self.lock_dir = lock_dir
+        self.poll_interval = poll_interval
+
+        # lock files are named after a hash of the api key, so that
+        # processes using different keys don't limit one another
+        self.lock_name = hashlib.md5((api_key or '').encode()).hexdigest()
+
+        self._slot_files = None
+        self._held_slots = set()
+        self._slot_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, api_key, **kwargs):
+
+        # a governor coordinating every process on this host
+        kwargs.setdefault('lock_dir', tempfile.gettempdir())
+
+        return cls(api_key=api_key, **kwargs)
+
+    def _open_slot_files(self):
+
+        if self._slot_files is None:
+            self._slot_files = [
+                os.open(
+                    os.path.join(
+                        self.lock_dir,
+                        'mailchimpy-{}-{}.lock'.format(self.lock_name, i)),
+                    os.O_RDWR | os.O_CREAT
+                )
+                for i in range(self.max_concurrent)
+            ]
+
+        return self._slot_files
+
+    def _acquire_file_slot(self):
+
+        while True:
+
+            with self._slot_lock:
+                for i, fd in enumerate(self._open_slot_files()):
+
+                    # a flock is held per open file, so threads in this
+                    # process must also avoid slots held by one another
+                    if i in self._held_slots:
+                        continue
+
+                    try:
+                        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except OSError:
+                        continue
+
+                    self._held_slots.add(i)
+                    return i
+
+            time.sleep(self.poll_interval)
+
+    def _release_file_slot(self, i):
+
+        with self._slot_lock:
+            fcntl.flock(self._slot_files[i], fcntl.LOCK_UN)
+            self._held_slots.discard(i)
+
+    @contextmanager
+    def slot(self):
+
+        if self.bucket is not None:
+            self.bucket.acquire()
+
+        with self.semaphore:
+
+            if self.lock_dir is None:
+                yield
+                return
+
+            i = self._acquire_file_slot()
+            try:
+                yield
+            finally:
+                self._release_file_slot(i)
+
+    def close(self):
+
+        if self._slot_files is not None:
+            for fd in self._slot_files:
+                os.close(fd)
+            self._slot_files = None
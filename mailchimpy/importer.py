@@ -0,0 +1,195 @@
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+
+from .mailchimpy import _chunks, _ordered_map
+
+
+def read_emails(path, input_format=None, column='email'):
+
+    # stream the email addresses out of a csv or ndjson file, one record
+    # at a time. records without the column yield None, so that record
+    # counts (and so checkpoints) still line up with the file
+    if input_format is None:
+        input_format = 'ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv'
+
+    with open(path, newline='', encoding='utf-8') as f:
+        if input_format == 'csv':
+            for row in csv.DictReader(f):
+                yield row.get(column)
+        elif input_format == 'ndjson':
+            for line in f:
+                if line.strip():
+                    yield json.loads(line).get(column)
+        else:
+            raise ValueError('Unknown format: {}'.format(input_format))
+
+
+def normalize_emails(emails):
+
+    # returns (email, subscriber hash) pairs for the valid addresses in a
+    # chunk, lower cased as MailChimp does when hashing
+    normalized = []
+
+    for email in emails:
+        if not email:
+            continue
+        email = email.strip().lower()
+        if '@' not in email:
+            continue
+        normalized.append((email, hashlib.md5(email.encode()).digest()))
+
+    return normalized
+
+
+class BoundedSeenSet(object):
+
+    # remembers the subscriber hashes of up to `capacity` addresses. once
+    # full, further addresses are let through unchecked, which is safe
+    # because a duplicate only costs a wasted write, or a "member exists"
+    # error when existing members aren't being updated
+    def __init__(self, capacity):
+
+        self.capacity = capacity
+        self._seen = set()
+
+    def add(self, digest):
+
+        # returns False if the digest has been seen before
+        if digest in self._seen:
+            return False
+
+        if len(self._seen) < self.capacity:
+            self._seen.add(digest)
+
+        return True
+
+
+class Checkpoint(object):
+
+    # records how many input records have been imported, so that an
+    # interrupted import can carry on from where it got to
+    def __init__(self, path):
+
+        self.path = path
+
+    def load(self):
+
+        try:
+            with open(self.path) as f:
+                return json.load(f)['records']
+        except FileNotFoundError:
+            return 0
+
+    def save(self, records):
+
+        # write then rename, so that a crash never leaves a torn checkpoint
+        temp_path = '{}.tmp'.format(self.path)
+        with open(temp_path, 'w') as f:
+            json.dump({'records': records}, f)
+        os.replace(temp_path, self.path)
+
+
+def import_emails(client, list_id, path, input_format=None, column='email',
+                  chunk_size=500, parallel=4, processes=None,
+                  checkpoint_path=None, dedupe_capacity=1000000,
+                  report_interval=10, update_existing=False, out=sys.stderr):
+
+    # existing members are left as they are unless `update_existing` is
+    # set, so that contacts who have unsubscribed aren't subscribed again.
+    # without it, existing members are reported as errors
+    processes = processes or os.cpu_count() or 1
+
+    checkpoint = Checkpoint(checkpoint_path) if checkpoint_path else None
+    skip = checkpoint.load() if checkpoint else 0
+    seen = BoundedSeenSet(dedupe_capacity)
+
+    stats = {
+        'records': skip, 'duplicates': 0, 'invalid': 0,
+        'new': 0, 'updated': 0, 'errors': 0, 'rejected': 0
+    }
+
+    # set once the api turns a whole chunk away, after which the checkpoint
+    # no longer moves, so that resuming sends that chunk again
+    rejected = False
+
+    started = last_report = time.time()
+
+    # each chunk of input records is normalized and hashed in a worker
+    # process, de-duplicated here, then sent by one of `parallel` threads.
+    # both stages keep a bounded number of chunks in flight, so memory
+    # stays flat however large the input file is
+    chunks = _chunks(islice(read_emails(path, input_format, column), skip, None), chunk_size)
+
+    def deduplicate(normalized_chunks):
+
+        for records, normalized in normalized_chunks:
+            emails = [email for email, digest in normalized if seen.add(digest)]
+            stats['invalid'] += records - len(normalized)
+            stats['duplicates'] += len(normalized) - len(emails)
+            yield records, emails
+
+    def upload(chunk):
+
+        records, emails = chunk
+        if not emails:
+            return records, None
+        return records, client.subscribe_emails_to_list(
+            emails, list_id, update_existing=update_existing)
+
+    with ProcessPoolExecutor(processes) as process_pool, \
+            ThreadPoolExecutor(parallel) as thread_pool:
+
+        normalized = _ordered_map(
+            process_pool, _normalize_chunk, chunks, processes * 2)
+
+        for records, result in _ordered_map(
+                thread_pool, upload, deduplicate(normalized), parallel * 2):
+
+            stats['records'] += records
+
+            if result is not None:
+                stats['new'] += len(result['new'])
+                stats['updated'] += len(result['updated'])
+                stats['errors'] += len(result['errors'])
+                stats['rejected'] += len(result['rejected'])
+                rejected = rejected or bool(result['rejected'])
+
+            # results arrive in input order, so unless a chunk was rejected
+            # every record up to here has been imported. chunks after a
+            # rejected one are sent again on resuming, which is harmless,
+            # though without `update_existing` their members are then
+            # reported as errors because they already exist
+            if checkpoint and not rejected:
+                checkpoint.save(stats['records'])
+
+            if out is not None and time.time() - last_report >= report_interval:
+                last_report = time.time()
+                _report(out, stats, skip, started)
+
+    if out is not None:
+        _report(out, stats, skip, started)
+
+    return stats
+
+
+def _normalize_chunk(chunk):
+
+    # run in worker processes, so must be a module level function
+    return len(chunk), normalize_emails(chunk)
+
+
+def _report(out, stats, skip, started):
+
+    elapsed = time.time() - started
+    out.write(
+        '{records} records, {new} new, {updated} updated, {errors} errors '
+        '({rejected} rejected), {duplicates} duplicates, {invalid} invalid '
+        '({rate:.0f} records/s)\n'.format(
+            rate=(stats['records'] - skip) / elapsed if elapsed else 0, **stats))
+    out.flush()
@@ -0,0 +1,154 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class InterestIndex(object):
+
+    # the most items MailChimp returns in one page
+    PAGE_SIZE = 1000
+
+    def __init__(self, client, list_id, ttl=300, max_workers=10):
+
+        self.client = client
+        self.list_id = list_id
+
+        # the index is reloaded on the first lookup more than `ttl`
+        # seconds after it was last loaded
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self.loaded_at = None
+
+        # category title -> {'id': category id, 'interests': {name: id}}
+        self._categories = {}
+        self._lock = threading.RLock()
+
+    def _get_all(self, key, name_field, endpoint, *args):
+
+        # page through a collection, requesting only ids and names
+        items = []
+        offset = 0
+
+        while True:
+            response = self.client._request(
+                'GET', endpoint, *args,
+                params={
+                    'count': self.PAGE_SIZE,
+                    'offset': offset,
+                    'fields': 'total_items,{0}.id,{0}.{1}'.format(key, name_field)
+                }
+            )
+
+            if response.status_code != 200:
+                raise Exception('Unexpected API response: http status code')
+
+            body = response.json()
+            items.extend(body.get(key, []))
+            offset += self.PAGE_SIZE
+
+            if offset >= body.get('total_items', 0):
+                return items
+
+    def refresh(self):
+
+        categories = self._get_all(
+            'categories', 'title', 'lists/{}/interest-categories', self.list_id)
+
+        # each category's interests are a separate collection, so fetch
+        # them all at once rather than one category after another
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            interests = executor.map(
+                lambda category: self._get_all(
+                    'interests', 'name', 'lists/{}/interest-categories/{}/interests',
+                    self.list_id, category['id']),
+                categories)
+
+            index = {
+                category['title']: {
+                    'id': category['id'],
+                    'interests': {
+                        interest['name']: interest['id'] for interest in category_interests
+                    }
+                }
+                for category, category_interests in zip(categories, interests)
+            }
+
+        with self._lock:
+            self._categories = index
+            self.loaded_at = time.time()
+
+    def _index(self):
+
+        with self._lock:
+            if self.loaded_at is None or time.time() - self.loaded_at > self.ttl:
+                self.refresh()
+            return self._categories
+
+    def category_id(self, category_title):
+
+        category = self._index().get(category_title)
+
+        return category['id'] if category is not None else None
+
+    def interest_id(self, category_title, interest_name):
+
+        category = self._index().get(category_title)
+
+        if category is None:
+            return None
+
+        return category['interests'].get(interest_name)
+
+    def interests(self, category_title):
+
+        category = self._index().get(category_title)
+
+        return dict(category['interests']) if category is not None else {}
+
+    def ensure_category(self, category_title, category_type='checkboxes'):
+
+        # returns the id of the named category, creating it first if need
+        # be. the new category is added to the index from the response to
+        # its creation, so there is no need to reload the index
+        with self._lock:
+
+            category_id = self.category_id(category_title)
+            if category_id is not None:
+                return category_id
+
+            response = self.client._request(
+                'POST', 'lists/{}/interest-categories', self.list_id,
+                json={'title': category_title, 'type': category_type}
+            )
+
+            if response.status_code != 200:
+                raise Exception('Unexpected API response: http status code')
+
+            category_id = response.json()['id']
+            self._categories[category_title] = {'id': category_id, 'interests': {}}
+
+            return category_id
+
+    def ensure_interest(self, category_title, interest_name):
+
+        with self._lock:
+
+            category_id = self.ensure_category(category_title)
+
+            interest_id = self.interest_id(category_title, interest_name)
+            if interest_id is not None:
+                return interest_id
+
+            response = self.client._request(
+                'POST', 'lists/{}/interest-categories/{}/interests',
+                self.list_id, category_id,
+                json={'name': interest_name}
+            )
+
+            if response.status_code != 200:
+                raise Exception('Unexpected API response: http status code')
+
+            interest_id = response.json()['id']
+            self._categories[category_title]['interests'][interest_name] = interest_id
+
+            return interest_id
@@ -1,8 +1,106 @@
 import os
 import requests
 import hashlib
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pprint import pformat
 
+from .batch import BatchJob
+from .retry import RetryPolicy
+
+
+def _chunks(iterable, size):
+
+    # yield successive lists of at most `size` items, without ever
+    # materialising the whole iterable
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _ordered_map(executor, fn, iterable, window):
+
+    # like executor.map, but keeping at most `window` calls in flight, so
+    # that a long or endless iterable isn't read ahead into memory. results
+    # are yielded in the same order as the iterable
+    pending = deque()
+
+    for item in iterable:
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(executor.submit(fn, item))
+
+    while pending:
+        yield pending.popleft().result()
+
+
+def _projection(fields=None, exclude_fields=None, prefix=''):
+
+    # build the query parameters which limit a response to the named
+    # fields. `prefix` qualifies field names within a collection, e.g.
+    # 'members.' for a page of list members
+    params = {}
+
+    if fields is not None:
+        params['fields'] = ','.join(prefix + field for field in fields)
+
+    if exclude_fields is not None:
+        params['exclude_fields'] = ','.join(prefix + field for field in exclude_fields)
+
+    return params
+
+
+def _subscriber_hash(email):
+
+    # mailchimp identifies each member by the md5 of their lower cased
+    # email address, so differently cased addresses are the same member
+    return hashlib.md5(email.lower().encode()).hexdigest()
+
+
+def _body_size(body):
+
+    # the size in bytes of a prepared request's body
+    if body is None:
+        return 0
+    if isinstance(body, str):
+        return len(body.encode('utf-8'))
+    return len(body)
+
+
+def _subscription_status(status_code, member):
+
+    # interpret the response to a GET on a list member as a tuple of
+    # (exists, subscribed). shared by every client that looks up members
+    if status_code == 404:
+        exists = False
+        subscribed = None
+    elif status_code == 200:
+        exists = True
+        if member.get('status') == MailChimpClient.MEMBER_STATUS.SUBSCRIBED:
+            subscribed = True
+        elif member.get('status') in (
+            MailChimpClient.MEMBER_STATUS.UNSUBSCRIBED,
+            MailChimpClient.MEMBER_STATUS.CLEANED,
+            MailChimpClient.MEMBER_STATUS.PENDING,
+            # members who only receive transactional email, or who have
+            # been archived, are on the list but not subscribed to it
+            MailChimpClient.MEMBER_STATUS.TRANSACTIONAL,
+            MailChimpClient.MEMBER_STATUS.ARCHIVED
+        ):
+            subscribed = False
+        else:
+            raise Exception('Unexpected API response: member status')
+    else:
+        raise Exception('Unexpected API response: http status code')
+
+    return (exists, subscribed)
+
 
 class MailChimpClient(object):
 
@@ -11,8 +109,13 @@ class MailChimpClient(object):
         UNSUBSCRIBED = 'unsubscribed'
         CLEANED = 'cleaned'
         PENDING = 'pending'
+        TRANSACTIONAL = 'transactional'
+        ARCHIVED = 'archived'
 
-    def __init__(self, api_key):
+    def __init__(self, api_key, pool_connections=10, pool_maxsize=10,
+                 pool_block=False, connect_timeout=None, read_timeout=None,
+                 governor=None, retry_policy=None, cache=None, api_root=None,
+                 hooks=None):
 
         self.api_key = api_key
 
@@ -20,60 +123,271 @@ class MailChimpClient(object):
         # is always the last 3 characters of the api key
         self.subdomain = self.api_key.split('-')[-1]
 
+        # the api can be pointed elsewhere, e.g. at a FakeMailChimpServer
+        self.api_root = api_root or 'https://{}.api.mailchimp.com/3.0/'.format(
+            self.subdomain)
+
         # set up a session for requests to be made in
         self.session = requests.Session()
 
+        # size the session's connection pool. `pool_connections` is the
+        # number of hosts to keep pools for, `pool_maxsize` the number of
+        # keep-alive connections kept open to each host. with `pool_block`
+        # set, threads wait for a free connection instead of opening extra
+        # connections which are discarded after use
+        self.adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block
+        )
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+
+        self.timeout = (connect_timeout, read_timeout)
+
+        # an optional ConcurrencyGovernor, limiting how many requests this
+        # client (or every client sharing the governor) has in flight
+        self.governor = governor
+
+        # how to retry requests which fail transiently. pass
+        # RetryPolicy(max_retries=0) to disable retries
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+
+        # an optional SubscriptionCache of (exists, subscribed) statuses,
+        # kept up to date by this client's own writes
+        self.cache = cache
+
+        # objects told about every api request, e.g. a RequestMetrics. each
+        # has on_request_start and on_request_end methods, which are passed
+        # a dict describing the request (see _request)
+        self.hooks = list(hooks or ())
+
+    def _request(self, method, endpoint, *args, idempotent=None, url=None, **kwargs):
+
+        # `endpoint` is a path template relative to the api root, e.g.
+        # 'lists/{}/members/{}', which is filled in with `args`. a full `url`
+        # may be given instead, e.g. a pre-signed download link, in which
+        # case `endpoint` just names the request to hooks
+        path = endpoint.format(*args)
+        if url is None:
+            url = self.api_root + path
+        kwargs.setdefault('timeout', self.timeout)
+
+        # requests made with methods that aren't idempotent by definition
+        # can still be marked as safe to retry, e.g. a PATCH setting status
+        if idempotent is None:
+            idempotent = method in RetryPolicy.IDEMPOTENT_METHODS
+
+        # without hooks there is nothing to measure, so skip all of it
+        if not self.hooks:
+            return self._retrying_send(method, url, idempotent, kwargs)
+
+        # `endpoint` rather than `path` identifies the request to hooks, so
+        # that requests for different members are counted together
+        event = {
+            'method': method,
+            'endpoint': endpoint,
+            'path': path,
+            'status_code': None,
+            'bytes_sent': 0,
+            'bytes_received': 0,
+            'retries': 0,
+            'elapsed': None,
+            'error': None
+        }
+
+        for hook in self.hooks:
+            hook.on_request_start(event)
+
+        started = time.perf_counter()
+        try:
+            response = self._retrying_send(method, url, idempotent, kwargs, event)
+        except Exception as e:
+            event['error'] = e
+            raise
+        else:
+            event['status_code'] = response.status_code
+            event['bytes_sent'] = _body_size(response.request.body)
+            # don't read the body of a streamed response to measure it
+            event['bytes_received'] = (
+                int(response.headers.get('Content-Length', 0)) if kwargs.get('stream')
+                else len(response.content))
+            return response
+        finally:
+            event['elapsed'] = time.perf_counter() - started
+            for hook in self.hooks:
+                hook.on_request_end(event)
+
+    def _retrying_send(self, method, url, idempotent, kwargs, event=None):
+
+        retries = 0
+
+        while True:
+
+            try:
+                response = self._governed_send(method, url, **kwargs)
+            except requests.exceptions.ConnectionError:
+                if not (self.retry_policy.is_retryable(idempotent) and
+                        self.retry_policy.consume(retries)):
+                    raise
+                response = None
+            else:
+                if not (self.retry_policy.is_retryable(idempotent, response) and
+                        self.retry_policy.consume(retries)):
+                    return response
+
+            time.sleep(self.retry_policy.delay(retries, response))
+            retries += 1
+
+            # hand the connection back, which a streamed response that
+            # hasn't been read would otherwise keep hold of
+            if response is not None:
+                response.close()
+
+            if event is not None:
+                event['retries'] = retries
+
+    def _governed_send(self, method, url, **kwargs):
+
+        if self.governor is None:
+            return self._send(method, url, **kwargs)
+
+        with self.governor.slot():
+            return self._send(method, url, **kwargs)
+
+    def _send(self, method, url, **kwargs):
+
+        # requests which mustn't carry our credentials pass auth=None
+        kwargs.setdefault('auth', ('apikey', self.api_key))
+
+        return self.session.request(method, url, **kwargs)
+
+    def pool_stats(self):
+
+        # report, for each host connected to, how many connections have
+        # been opened against how many requests made. when connections are
+        # being reused, `requests` will be much larger than `connections`
+        stats = {}
+
+        for key in self.adapter.poolmanager.pools.keys():
+            pool = self.adapter.poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            stats['{}://{}:{}'.format(pool.scheme, pool.host, pool.port)] = {
+                'connections': pool.num_connections,
+                'requests': pool.num_requests,
+                # the pool's queue is filled up with None placeholders, which
+                # are only swapped for connections as they are opened and
+                # handed back, so count just the connections
+                'idle': sum(
+                    1 for connection in list(pool.pool.queue) if connection is not None
+                ) if pool.pool is not None else 0,
+                'maxsize': pool.pool.maxsize if pool.pool is not None else 0
+            }
+
+        return stats
+
+    # for collaborators such as BatchJob, which can't import it from here
+    _subscriber_hash = staticmethod(_subscriber_hash)
+
     def _get_md5(self, string):
 
         hashobject = hashlib.md5(string.encode())
         md5 = hashobject.hexdigest()
         return md5
 
-    def get_api_root(self):
+    def _cache_status(self, list_id, email, status):
 
-        response = self.session.get(
-            'https://{}.api.mailchimp.com/3.0/'.format(self.subdomain),
-            auth=('apikey', self.api_key)
-        )
+        # record what a write tells us about a member's status, or forget
+        # the member if `status` is None because its state is now unknown
+        if self.cache is None:
+            return
+
+        key = (list_id, _subscriber_hash(email))
+
+        if status is None:
+            self.cache.invalidate(key)
+        else:
+            self.cache.set(key, status)
+
+    def get_api_root(self, fields=None, exclude_fields=None):
+
+        response = self._request(
+            'GET', '', params=_projection(fields, exclude_fields))
 
         return response
 
-    def check_subscription_status(self, email, list_id):
+    def check_subscription_status(self, email, list_id, fields=('status',),
+                                  exclude_fields=None):
 
-        email_md5 = self._get_md5(email)
+        email_md5 = _subscriber_hash(email)
 
-        response = self.session.get(
-            'https://{}.api.mailchimp.com/3.0/lists/{}/members/{}'.format(
-                self.subdomain, list_id, email_md5),
-            auth=('apikey', self.api_key)
+        if self.cache is not None:
+            status = self.cache.get((list_id, email_md5))
+            if status is not self.cache.MISSING:
+                return status
+
+        # only the member's status is needed, so by default nothing else is
+        # downloaded
+        response = self._request(
+            'GET', 'lists/{}/members/{}', list_id, email_md5,
+            params=_projection(fields, exclude_fields)
         )
 
-        if response.status_code == 404:
-            exists = False
-            subscribed = None
-        elif response.status_code == 200:
-            exists = True
-            if response.json().get('status') == self.MEMBER_STATUS.SUBSCRIBED:
-                subscribed = True
-            elif response.json().get('status') in (
-                self.MEMBER_STATUS.UNSUBSCRIBED,
-                self.MEMBER_STATUS.CLEANED,
-                self.MEMBER_STATUS.PENDING
-            ):
-                subscribed = False
-            else:
-                raise Exception('Unexpected API response: member status')
-        else:
-            raise Exception('Unexpected API response: http status code')
+        status = _subscription_status(
+            response.status_code,
+            response.json() if response.status_code == 200 else None
+        )
 
-        return (exists, subscribed)
+        if self.cache is not None:
+            self.cache.set((list_id, email_md5), status)
+
+        return status
+
+    def check_subscription_status_many(self, emails, list_id, batch_threshold=1000,
+                                       max_workers=10, fields=('status',),
+                                       exclude_fields=None):
+
+        # de-duplicate, keeping the order the emails were given in
+        emails = list(dict.fromkeys(emails))
+
+        if len(emails) < batch_threshold:
+            # for smaller numbers of emails, concurrent GETs over the
+            # session's keep-alive connections finish sooner than a batch
+            # could be processed by MailChimp
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                statuses = executor.map(
+                    lambda email: self.check_subscription_status(
+                        email, list_id, fields, exclude_fields),
+                    emails)
+                return dict(zip(emails, statuses))
+
+        # for larger numbers, submit every lookup as a single batch, using
+        # each email's hash to match results back up with the email.
+        # emails differing only in case are one member, looked up once
+        job = BatchJob(self)
+        emails_by_md5 = {}
+        for email in emails:
+            email_md5 = _subscriber_hash(email)
+            if email_md5 not in emails_by_md5:
+                emails_by_md5[email_md5] = []
+                job.check_subscription_status(
+                    email, list_id, operation_id=email_md5,
+                    params=_projection(fields, exclude_fields))
+            emails_by_md5[email_md5].append(email)
+
+        statuses = {}
+        for result in job.run():
+            status = _subscription_status(result.status_code, result.response)
+            for email in emails_by_md5[result.operation_id]:
+                statuses[email] = status
+
+        return statuses
 
     def subscribe_email_to_list(self, email, list_id):
 
-        response = self.session.post(
-            'https://{}.api.mailchimp.com/3.0/lists/{}/members'.format(
-                self.subdomain, list_id),
-            auth=('apikey', self.api_key),
+        response = self._request(
+            'POST', 'lists/{}/members', list_id,
             json={'email_address': email, 'status': 'subscribed'}
         )
 
@@ -84,33 +398,368 @@ class MailChimpClient(object):
         else:
             success = None
 
+        self._cache_status(list_id, email, (True, True) if success else None)
+
         return success
 
+    def subscribe_emails_to_list(self, emails, list_id, update_existing=False):
+
+        return self._batch_update_members(
+            ((email, self.MEMBER_STATUS.SUBSCRIBED) for email in emails),
+            list_id, update_existing
+        )
+
+    def set_subscriptions(self, subscriptions, list_id):
+
+        # the bulk form of set_subscription, taking (email, status) pairs
+        # and creating or updating each member
+        return self._batch_update_members(subscriptions, list_id, True)
+
+    def _batch_update_members(self, subscriptions, list_id, update_existing):
+
+        # the batch subscribe endpoint accepts at most this many members
+        # per request
+        BATCH_SIZE = 500
+
+        # `rejected` holds the addresses in chunks which failed for a
+        # passing reason, i.e. a 429, a server error or a dropped
+        # connection, so may well succeed if sent again. they are also
+        # reported in `errors`. chunks refused with any other status, such
+        # as a 404 for a deleted list, would fail again however often they
+        # were sent, so are only reported in `errors`
+        report = {'new': [], 'updated': [], 'errors': [], 'rejected': []}
+
+        for chunk in _chunks(subscriptions, BATCH_SIZE):
+
+            # an upsert leaves the list the same however many times it is
+            # sent, so it can be retried like the unsubscribe PATCH
+            try:
+                response = self._request(
+                    'POST', 'lists/{}', list_id,
+                    json={
+                        'members': [
+                            {'email_address': email, 'status': status}
+                            for email, status in chunk
+                        ],
+                        'update_existing': update_existing
+                    },
+                    idempotent=update_existing
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                response = None
+
+            if response is None:
+                new = updated = []
+                report['errors'].extend(
+                    {'email': email, 'error': 'connection failed'} for email, status in chunk)
+                report['rejected'].extend(email for email, status in chunk)
+            elif response.status_code == 200:
+                body = response.json()
+                new = [member['email_address'] for member in body.get('new_members', [])]
+                updated = [member['email_address'] for member in body.get('updated_members', [])]
+                report['new'].extend(new)
+                report['updated'].extend(updated)
+                report['errors'].extend(
+                    {'email': error.get('email_address'), 'error': error.get('error')}
+                    for error in body.get('errors', []))
+            else:
+                # the whole chunk was rejected, so every address in it failed
+                new = updated = []
+                report['errors'].extend(
+                    {'email': email, 'error': 'http status {}'.format(response.status_code)}
+                    for email, status in chunk)
+                if response.status_code == 429 or response.status_code >= 500:
+                    report['rejected'].extend(email for email, status in chunk)
+
+            if self.cache is not None:
+                # mailchimp echoes addresses back lower cased
+                succeeded = set(email.lower() for email in new + updated)
+                for email, status in chunk:
+                    self._cache_status(
+                        list_id, email,
+                        (True, status == self.MEMBER_STATUS.SUBSCRIBED)
+                        if email.lower() in succeeded else None)
+
+        return report
+
     def unsubscribe_email_from_list(self, email, list_id):
 
-        email_md5 = self._get_md5(email)
-        response = self.session.patch(
-            'https://{}.api.mailchimp.com/3.0/lists/{}/members/{}'.format(
-                self.subdomain, list_id, email_md5),
-            auth=('apikey', self.api_key),
-            json={'status': 'unsubscribed'}
+        email_md5 = _subscriber_hash(email)
+        response = self._request(
+            'PATCH', 'lists/{}/members/{}', list_id, email_md5,
+            json={'status': 'unsubscribed'},
+            idempotent=True
         )
 
         if response.status_code == 200:
             success = True
+            self._cache_status(list_id, email, (True, False))
         elif response.status_code == 404:
             success = None
+            self._cache_status(list_id, email, (False, None))
         else:
             success = False
+            self._cache_status(list_id, email, None)
 
         return success
 
+    def set_subscription(self, email, list_id, status, merge_fields=None):
+
+        # a single upsert, creating the member if need be, so there is no
+        # need to check whether the member exists beforehand
+        member = {
+            'email_address': email,
+            'status_if_new': status,
+            'status': status
+        }
+
+        if merge_fields is not None:
+            member['merge_fields'] = merge_fields
+
+        email_md5 = _subscriber_hash(email)
+        response = self._request(
+            'PUT', 'lists/{}/members/{}', list_id, email_md5, json=member)
+
+        if response.status_code == 200:
+            success = True
+            self._cache_status(
+                list_id, email, (True, status == self.MEMBER_STATUS.SUBSCRIBED))
+        elif response.status_code == 400:
+            success = False
+            self._cache_status(list_id, email, None)
+        else:
+            success = None
+            self._cache_status(list_id, email, None)
+
+        return success
+
+    def _get_members_page(self, list_id, offset, count, params):
+
+        response = self._request(
+            'GET', 'lists/{}/members', list_id,
+            params=dict(params, offset=offset, count=count)
+        )
+
+        if response.status_code != 200:
+            raise Exception('Unexpected API response: http status code')
+
+        return response.json()
+
+    def iter_list_members(self, list_id, status=None, fields=None,
+                          exclude_fields=None, page_size=1000,
+                          since_last_changed=None):
+
+        # `fields` names the member fields wanted, e.g. ['email_address'],
+        # so that only those are sent over the wire
+        params = _projection(fields, exclude_fields, prefix='members.')
+
+        # total_items is always needed to know when to stop paging
+        if fields is not None:
+            params['fields'] = 'total_items,' + params['fields']
+
+        if status is not None:
+            params['status'] = status
+
+        # only members changed after this ISO 8601 time are returned
+        if since_last_changed is not None:
+            params['since_last_changed'] = since_last_changed
+
+        # fetch each page in the background while the caller is still
+        # working through the previous one
+        with ThreadPoolExecutor(max_workers=1) as executor:
+
+            offset = 0
+            page = executor.submit(
+                self._get_members_page, list_id, offset, page_size, params)
+
+            while page is not None:
+
+                body = page.result()
+                members = body.get('members', [])
+                offset += page_size
+
+                if len(members) == page_size and offset < body.get('total_items', 0):
+                    page = executor.submit(
+                        self._get_members_page, list_id, offset, page_size, params)
+                else:
+                    page = None
+
+                for member in members:
+                    yield member
+
+    def set_member_interests_bulk(self, list_id, member_interests):
+
+        # `member_interests` maps email -> {interest id: bool}. emails
+        # differing only in case are one member, so are collapsed into a
+        # single change, the last given winning as with any other write
+        interests_by_md5 = {}
+        emails_by_md5 = {}
+        for email, interests in member_interests.items():
+            email_md5 = _subscriber_hash(email)
+            interests_by_md5[email_md5] = interests
+            emails_by_md5.setdefault(email_md5, []).append(email)
+
+        # members receiving the same change share one encoded request body
+        groups = {}
+        for email_md5, interests in interests_by_md5.items():
+            key = tuple(sorted(interests.items()))
+            groups.setdefault(key, []).append(email_md5)
+
+        job = BatchJob(self)
+
+        for interests, md5s in groups.items():
+            body = json.dumps({'interests': dict(interests)})
+            for email_md5 in md5s:
+                job.add_operation(
+                    'PATCH', 'lists/{}/members/{}', list_id, email_md5,
+                    body=body, operation_id=email_md5)
+
+        # maps each email to whether its member's interests were updated
+        results = dict.fromkeys(member_interests, False)
+        for result in job.run():
+            for email in emails_by_md5[result.operation_id]:
+                results[email] = result.status_code == 200
+
+        return results
+
+    def update_segment_members(self, list_id, segment_id, add=(), remove=(),
+                               max_workers=10):
+
+        # the static segment endpoint accepts at most this many members to
+        # add or remove per request
+        BATCH_SIZE = 500
+
+        def updates():
+            for chunk in _chunks(add, BATCH_SIZE):
+                yield 'members_to_add', chunk
+            for chunk in _chunks(remove, BATCH_SIZE):
+                yield 'members_to_remove', chunk
+
+        def send(update):
+            action, chunk = update
+            return chunk, self._request(
+                'POST', 'lists/{}/segments/{}', list_id, segment_id,
+                json={action: chunk})
+
+        report = {'added': 0, 'removed': 0, 'errors': []}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for chunk, response in _ordered_map(executor, send, updates(), max_workers):
+
+                if response.status_code == 200:
+                    body = response.json()
+                    report['added'] += body.get('total_added', 0)
+                    report['removed'] += body.get('total_removed', 0)
+                    report['errors'].extend(
+                        {'email': email, 'error': error.get('error')}
+                        for error in body.get('errors', [])
+                        for email in error.get('email_addresses', []))
+                else:
+                    # the whole chunk was rejected, so every address in it failed
+                    report['errors'].extend(
+                        {'email': email, 'error': 'http status {}'.format(response.status_code)}
+                        for email in chunk)
+
+        return report
+
+    def add_emails_to_segment(self, emails, list_id, segment_id):
+
+        return self.update_segment_members(list_id, segment_id, add=emails)
+
+    def remove_emails_from_segment(self, emails, list_id, segment_id):
+
+        return self.update_segment_members(list_id, segment_id, remove=emails)
+
+    def get_tag_id(self, tag_name, list_id, create=True):
+
+        # tags are static segments, so bulk tagging goes through the same
+        # segment endpoint once the tag's segment id is known
+        offset = 0
+
+        while True:
+            response = self._request(
+                'GET', 'lists/{}/segments', list_id,
+                params={
+                    'type': 'static',
+                    'count': 1000,
+                    'offset': offset,
+                    'fields': 'total_items,segments.id,segments.name'
+                }
+            )
+
+            if response.status_code != 200:
+                raise Exception('Unexpected API response: http status code')
+
+            body = response.json()
+            for segment in body.get('segments', []):
+                if segment['name'] == tag_name:
+                    return segment['id']
+
+            offset += 1000
+            if offset >= body.get('total_items', 0):
+                break
+
+        if not create:
+            return None
+
+        response = self._request(
+            'POST', 'lists/{}/segments', list_id,
+            json={'name': tag_name, 'static_segment': []}
+        )
+
+        if response.status_code != 200:
+            raise Exception('Unexpected API response: http status code')
+
+        return response.json()['id']
+
+    def update_tag_members(self, list_id, tag_name, add=(), remove=(), max_workers=10):
+
+        return self.update_segment_members(
+            list_id, self.get_tag_id(tag_name, list_id), add, remove, max_workers)
+
+    def reconcile(self, list_id, desired_emails, dry_run=False):
+
+        # make the list's subscribed members exactly `desired_emails`,
+        # sending only the subscribes and unsubscribes needed to get there.
+        # members are compared by subscriber hash, the md5 of the lower
+        # cased email, which is also the id MailChimp gives each member
+        desired = {}
+        for email in desired_emails:
+            desired[_subscriber_hash(email.strip())] = email.strip()
+
+        subscribed = {}
+        for member in self.iter_list_members(
+                list_id, status=self.MEMBER_STATUS.SUBSCRIBED,
+                fields=['id', 'email_address']):
+            subscribed[member['id']] = member['email_address']
+
+        to_subscribe = desired.keys() - subscribed.keys()
+        to_unsubscribe = subscribed.keys() - desired.keys()
+
+        report = {
+            'subscribe': len(to_subscribe),
+            'unsubscribe': len(to_unsubscribe),
+            'unchanged': len(desired) - len(to_subscribe)
+        }
+
+        if dry_run:
+            return report
+
+        report['subscribed'] = self.set_subscriptions(
+            ((desired[email_md5], self.MEMBER_STATUS.SUBSCRIBED)
+             for email_md5 in to_subscribe),
+            list_id)
+        report['unsubscribed'] = self.set_subscriptions(
+            ((subscribed[email_md5], self.MEMBER_STATUS.UNSUBSCRIBED)
+             for email_md5 in to_unsubscribe),
+            list_id)
+
+        return report
+
     def create_interest_category(self, category_name, list_id):
 
-        response = self.session.post(
-            'https://{}.api.mailchimp.com/3.0/lists/{}/interest-categories'.format(
-                self.subdomain, list_id),
-            auth=('apikey', self.api_key),
+        response = self._request(
+            'POST', 'lists/{}/interest-categories', list_id,
             json={'title': category_name, 'type': 'checkboxes'}
         )
 
@@ -119,12 +768,12 @@ class MailChimpClient(object):
 
         return success
 
-    def get_interest_category(self, category_id, list_id):
+    def get_interest_category(self, category_id, list_id, fields=('id',),
+                              exclude_fields=None):
 
-        response = self.session.get(
-            'https://{}.api.mailchimp.com/3.0/lists/{}/interest-categories/{}'.format(
-                self.subdomain, list_id, category_id),
-            auth=('apikey', self.api_key)
+        response = self._request(
+            'GET', 'lists/{}/interest-categories/{}', list_id, category_id,
+            params=_projection(fields, exclude_fields)
         )
 
         if response.status_code == 200:
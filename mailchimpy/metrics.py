@@ -0,0 +1,208 @@
+import threading
+from bisect import bisect_left
+
+
+class RequestHooks(object):
+
+    # the interface of a MailChimpClient hook. subclasses override either
+    # method. `event` is a dict of method, endpoint, path, status_code,
+    # bytes_sent, bytes_received, retries, elapsed (in seconds) and error,
+    # which is the exception raised, if any. only method, endpoint and path
+    # are filled in when the request starts
+
+    def on_request_start(self, event):
+
+        pass
+
+    def on_request_end(self, event):
+
+        pass
+
+
+# upper bounds, in seconds, of the latency histogram's buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class _EndpointStats(object):
+
+    def __init__(self, buckets):
+
+        # counts[i] is the number of requests taking at most buckets[i],
+        # and more than buckets[i - 1]. the last count is for the rest
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0
+        self.elapsed = 0.0
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.status_codes = {}
+
+    def copy(self):
+
+        copy = _EndpointStats(())
+        copy.__dict__.update(self.__dict__)
+        copy.counts = list(self.counts)
+        copy.status_codes = dict(self.status_codes)
+        return copy
+
+
+class RequestMetrics(RequestHooks):
+
+    # aggregates requests by method and endpoint template, keeping counts,
+    # bytes, retries and a latency histogram for each. the histograms use
+    # fixed buckets, so recording a request is a few additions however
+    # many requests have been seen
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix='mailchimpy'):
+
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self.in_flight = 0
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def on_request_start(self, event):
+
+        with self._lock:
+            self.in_flight += 1
+
+    def on_request_end(self, event):
+
+        key = (event['method'], event['endpoint'])
+        # requests which raised instead of getting a response are counted
+        # under a status of 'error'
+        status = event['status_code'] if event['status_code'] is not None else 'error'
+
+        with self._lock:
+            self.in_flight -= 1
+
+            stats = self._endpoints.get(key)
+            if stats is None:
+                stats = self._endpoints[key] = _EndpointStats(self.buckets)
+
+            stats.counts[bisect_left(self.buckets, event['elapsed'])] += 1
+            stats.total += 1
+            stats.elapsed += event['elapsed']
+            stats.retries += event['retries']
+            stats.bytes_sent += event['bytes_sent']
+            stats.bytes_received += event['bytes_received']
+            stats.status_codes[status] = stats.status_codes.get(status, 0) + 1
+
+    def reset(self):
+
+        with self._lock:
+            self._endpoints = {}
+
+    def _quantile(self, counts, total, q):
+
+        # estimate a quantile from a histogram, as prometheus does, by
+        # assuming requests are spread evenly through each bucket
+        rank = q * total
+        seen = 0
+
+        for i, count in enumerate(counts):
+            if count and seen + count >= rank:
+                if i == len(self.buckets):
+                    # beyond the last bucket, so the best answer is its bound
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+
+        return None
+
+    def _snapshot(self):
+
+        # copies of every endpoint's stats, sorted by method and endpoint,
+        # so that they can be read without holding the lock
+        with self._lock:
+            return sorted(
+                (key, stats.copy()) for key, stats in self._endpoints.items()
+            ), self.in_flight
+
+    def stats(self):
+
+        # a summary of each endpoint, keyed by (method, endpoint), slowest
+        # first by 95th percentile latency
+        summary = {}
+
+        for key, stats in self._snapshot()[0]:
+            summary[key] = {
+                'requests': stats.total,
+                'mean': stats.elapsed / stats.total,
+                'p50': self._quantile(stats.counts, stats.total, 0.5),
+                'p95': self._quantile(stats.counts, stats.total, 0.95),
+                'p99': self._quantile(stats.counts, stats.total, 0.99),
+                'retries': stats.retries,
+                'bytes_sent': stats.bytes_sent,
+                'bytes_received': stats.bytes_received,
+                'status_codes': stats.status_codes
+            }
+
+        return dict(sorted(summary.items(), key=lambda item: -item[1]['p95']))
+
+    def prometheus(self):
+
+        # the metrics in prometheus' text exposition format, e.g. to serve
+        # from a /metrics endpoint
+        endpoints, in_flight = self._snapshot()
+        lines = []
+
+        def metric(name, metric_type, description):
+            lines.append('# HELP {}_{} {}'.format(self.prefix, name, description))
+            lines.append('# TYPE {}_{} {}'.format(self.prefix, name, metric_type))
+
+        def sample(name, labels, value):
+            lines.append('{}_{}{{{}}} {}'.format(
+                self.prefix, name,
+                ','.join('{}="{}"'.format(label, _escape(text)) for label, text in labels),
+                _number(value)))
+
+        metric('requests_in_flight', 'gauge', 'Requests to the MailChimp API in progress.')
+        lines.append('{}_requests_in_flight {}'.format(self.prefix, in_flight))
+
+        metric('requests_total', 'counter', 'Requests made to the MailChimp API.')
+        for (method, endpoint), stats in endpoints:
+            for status, count in sorted(
+                    stats.status_codes.items(), key=lambda item: str(item[0])):
+                sample('requests_total', (
+                    ('method', method), ('endpoint', endpoint), ('status', status)), count)
+
+        metric('request_duration_seconds', 'histogram',
+               'Time taken by requests to the MailChimp API, including retries.')
+        for (method, endpoint), stats in endpoints:
+            labels = (('method', method), ('endpoint', endpoint))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), stats.counts):
+                cumulative += count
+                sample('request_duration_seconds_bucket', labels + (('le', bound),), cumulative)
+            sample('request_duration_seconds_sum', labels, stats.elapsed)
+            sample('request_duration_seconds_count', labels, stats.total)
+
+        for name, attribute, description in (
+                ('request_retries_total', 'retries',
+                 'Retries of requests to the MailChimp API.'),
+                ('request_bytes_sent_total', 'bytes_sent',
+                 'Bytes of request bodies sent to the MailChimp API.'),
+                ('response_bytes_received_total', 'bytes_received',
+                 'Bytes of response bodies received from the MailChimp API.')):
+            metric(name, 'counter', description)
+            for (method, endpoint), stats in endpoints:
+                sample(name, (('method', method), ('endpoint', endpoint)),
+                       getattr(stats, attribute))
+
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+
+    # integral values without a trailing .0, and bucket bounds as prometheus
+    # writes them
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
@@ -0,0 +1,149 @@
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from itertools import islice
+
+from .mailchimpy import _subscriber_hash, _subscription_status
+
+
+class ListMirror(object):
+
+    # the member fields kept in the mirror. `id` is MailChimp's subscriber
+    # hash, the md5 of the lower cased email address
+    FIELDS = ('id', 'email_address', 'status', 'last_changed')
+
+    # how many members to write to the database per statement
+    WRITE_BATCH_SIZE = 1000
+
+    def __init__(self, client, list_id, path, page_size=1000, overlap=5):
+
+        self.client = client
+        self.list_id = list_id
+        self.page_size = page_size
+
+        # last_changed is only to the second, and MailChimp returns members
+        # changed strictly after `since_last_changed`, so a change in the
+        # same second as the newest one mirrored would never be fetched.
+        # each sync reaches back this many seconds before the watermark to
+        # catch those, re-reading a few members it already has
+        self.overlap = overlap
+
+        # one connection is shared between threads, guarded by a lock.
+        # write-ahead logging lets other processes read the mirror while
+        # it is being synced
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS members ('
+            'list_id TEXT, subscriber_hash TEXT, email_address TEXT, '
+            'status TEXT, last_changed TEXT, '
+            'PRIMARY KEY (list_id, subscriber_hash))'
+        )
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS sync_state ('
+            'list_id TEXT PRIMARY KEY, last_changed TEXT, synced_at REAL)'
+        )
+        self.connection.commit()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+
+        with self._lock:
+            return self.connection.execute(
+                'SELECT COUNT(*) FROM members WHERE list_id = ?',
+                (self.list_id,)
+            ).fetchone()[0]
+
+    def _sync_state(self):
+
+        with self._lock:
+            row = self.connection.execute(
+                'SELECT last_changed, synced_at FROM sync_state WHERE list_id = ?',
+                (self.list_id,)
+            ).fetchone()
+
+        return row if row is not None else (None, None)
+
+    @property
+    def synced_at(self):
+
+        return self._sync_state()[1]
+
+    def sync(self):
+
+        # the first sync loads every member. later syncs only fetch members
+        # changed since shortly before the most recent change already
+        # mirrored. returns the number of members fetched
+        watermark, _ = self._sync_state()
+        synced_at = time.time()
+
+        since = None
+        if watermark is not None:
+            since = (
+                datetime.fromisoformat(watermark) - timedelta(seconds=self.overlap)
+            ).isoformat()
+
+        members = self.client.iter_list_members(
+            self.list_id, fields=self.FIELDS, page_size=self.page_size,
+            since_last_changed=since)
+
+        count = 0
+
+        while True:
+            rows = [
+                (self.list_id, member['id'], member['email_address'],
+                 member['status'], member['last_changed'])
+                for member in islice(members, self.WRITE_BATCH_SIZE)
+            ]
+
+            if not rows:
+                break
+
+            # each batch is committed separately, so that lookups aren't
+            # blocked while the next page is downloaded. a sync that fails
+            # part way through is simply repeated from the old watermark,
+            # and members read twice are just replaced
+            with self._lock, self.connection:
+                self.connection.executemany(
+                    'INSERT OR REPLACE INTO members VALUES (?, ?, ?, ?, ?)', rows)
+
+            count += len(rows)
+
+            # the watermark is taken from MailChimp's own timestamps,
+            # rather than our clock, so clock skew can't lose changes
+            latest = max(row[4] for row in rows)
+            if watermark is None or latest > watermark:
+                watermark = latest
+
+        with self._lock, self.connection:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)',
+                (self.list_id, watermark, synced_at)
+            )
+
+        return count
+
+    def check_subscription_status(self, email, max_staleness=None):
+
+        # with `max_staleness` set, the mirror is synced first if it was
+        # last synced longer ago than that many seconds
+        if max_staleness is not None:
+            synced_at = self.synced_at
+            if synced_at is None or time.time() - synced_at > max_staleness:
+                self.sync()
+
+        with self._lock:
+            row = self.connection.execute(
+                'SELECT status FROM members WHERE list_id = ? AND subscriber_hash = ?',
+                (self.list_id, _subscriber_hash(email))
+            ).fetchone()
+
+        if row is None:
+            return _subscription_status(404, None)
+
+        return _subscription_status(200, {'status': row[0]})
+
+    def close(self):
+
+        self.connection.close()
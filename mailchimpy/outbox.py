@@ -0,0 +1,150 @@
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from .mailchimpy import MailChimpClient
+
+
+class Outbox(object):
+
+    def __init__(self, path):
+
+        # every write is fsynced before set_subscription returns. with
+        # write-ahead logging each commit is a single append to the log
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=FULL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS outbox ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'list_id TEXT, email TEXT, status TEXT)'
+        )
+        self.connection.commit()
+
+        # guards the connection, which only one thread may use at a time
+        self._connection_lock = threading.Lock()
+
+        # writes waiting to be committed, and the sequence numbers of the
+        # last write appended and the last write known to be committed
+        self._buffer = []
+        self._appended = 0
+        self._committed = 0
+        self._committing = False
+        self._condition = threading.Condition()
+
+        self.commits = 0
+
+    def __len__(self):
+
+        with self._connection_lock:
+            return self.connection.execute('SELECT COUNT(*) FROM outbox').fetchone()[0]
+
+    def set_subscription(self, email, list_id, status):
+
+        # group commit: the first writer to arrive commits everything in
+        # the buffer. writers arriving while that commit is under way wait,
+        # and are all committed together by the next one, so that many
+        # concurrent writers share each fsync
+        with self._condition:
+
+            self._buffer.append((list_id, email, status))
+            self._appended += 1
+            sequence = self._appended
+
+            while self._committed < sequence:
+
+                if self._committing:
+                    self._condition.wait()
+                    continue
+
+                self._committing = True
+                rows, self._buffer = self._buffer, []
+                target = self._appended
+
+                # let other writers add to the buffer during the commit
+                self._condition.release()
+                committed = False
+                try:
+                    with self._connection_lock, self.connection:
+                        self.connection.executemany(
+                            'INSERT INTO outbox (list_id, email, status) VALUES (?, ?, ?)',
+                            rows)
+                    committed = True
+                finally:
+                    self._condition.acquire()
+                    self._committing = False
+                    if committed:
+                        self._committed = target
+                        self.commits += 1
+                    else:
+                        # hand the rows back, for the next writer to retry
+                        self._buffer = rows + self._buffer
+                    self._condition.notify_all()
+
+    def subscribe_email_to_list(self, email, list_id):
+
+        self.set_subscription(email, list_id, MailChimpClient.MEMBER_STATUS.SUBSCRIBED)
+
+    def unsubscribe_email_from_list(self, email, list_id):
+
+        self.set_subscription(email, list_id, MailChimpClient.MEMBER_STATUS.UNSUBSCRIBED)
+
+    def replay(self, client, batch_size=500):
+
+        # send every write in the outbox, oldest first. writes are only
+        # removed once sent, and set_subscriptions is an upsert, so
+        # replaying again after a crash part way through is harmless
+        replayed = 0
+        errors = 0
+
+        while True:
+
+            with self._connection_lock:
+                rows = self.connection.execute(
+                    'SELECT id, list_id, email, status FROM outbox ORDER BY id LIMIT ?',
+                    (batch_size,)
+                ).fetchall()
+
+            if not rows:
+                break
+
+            # only the last write for each member needs sending
+            subscriptions = OrderedDict()
+            for row_id, list_id, email, status in rows:
+                key = (list_id, email.lower())
+                subscriptions.pop(key, None)
+                subscriptions[key] = (email, status)
+
+            subscriptions_by_list = OrderedDict()
+            for (list_id, _), subscription in subscriptions.items():
+                subscriptions_by_list.setdefault(list_id, []).append(subscription)
+
+            for list_id, batch in subscriptions_by_list.items():
+                report = client.set_subscriptions(batch, list_id)
+
+                # writes which failed for a passing reason, such as a 503,
+                # weren't applied, so stop and keep them, and everything
+                # after them, for next time. any earlier lists in these rows
+                # are sent again, which is harmless as every write is an
+                # upsert
+                if report['rejected']:
+                    raise Exception('Unexpected API response: http status code')
+
+                # other errors, whether for single members, such as an
+                # invalid address, or for the whole list, such as a 404 for
+                # a deleted list, would fail again however often they were
+                # replayed, so are counted and dropped
+                errors += len(report['errors'])
+
+            with self._connection_lock, self.connection:
+                self.connection.execute(
+                    'DELETE FROM outbox WHERE id <= ?', (rows[-1][0],))
+
+            replayed += len(rows)
+
+        return {'replayed': replayed, 'errors': errors}
+
+    def close(self):
+
+        with self._connection_lock:
+            self.connection.close()
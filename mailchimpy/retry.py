@@ -0,0 +1,98 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+
+class RetryPolicy(object):
+
+    # 429 means the request was turned away before being processed, so it
+    # is always safe to retry. server errors and dropped connections may
+    # happen after the request took effect, so only idempotent requests
+    # are retried on those
+    RETRY_ANY_METHOD_STATUSES = (429,)
+    RETRY_IDEMPOTENT_STATUSES = (500, 502, 503, 504)
+    IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+
+    def __init__(self, max_retries=3, backoff_factor=0.5, max_backoff=30,
+                 retry_budget=None):
+
+        # the most times any single request will be retried
+        self.max_retries = max_retries
+
+        # the nth retry waits a random time of up to
+        # backoff_factor * 2 ** n seconds, capped at max_backoff
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+
+        # the total number of retries this policy will allow, across every
+        # request made with it. None means unlimited
+        self.retry_budget = retry_budget
+        self.retries_used = 0
+        self._lock = threading.Lock()
+
+    @property
+    def retries_remaining(self):
+
+        if self.retry_budget is None:
+            return None
+
+        return max(self.retry_budget - self.retries_used, 0)
+
+    def is_retryable(self, idempotent, response=None):
+
+        # `response` is None when the request failed to get a response at
+        # all, e.g. because the connection was reset
+        if response is None:
+            return idempotent
+
+        if response.status_code in self.RETRY_ANY_METHOD_STATUSES:
+            return True
+
+        return idempotent and response.status_code in self.RETRY_IDEMPOTENT_STATUSES
+
+    def consume(self, retries_so_far):
+
+        # claim a retry, returning False once this request has been
+        # retried too often or the overall budget is spent
+        if retries_so_far >= self.max_retries:
+            return False
+
+        with self._lock:
+            if self.retry_budget is not None and self.retries_used >= self.retry_budget:
+                return False
+            self.retries_used += 1
+
+        return True
+
+    def _retry_after(self, response):
+
+        value = response.headers.get('Retry-After') if response is not None else None
+
+        if value is None:
+            return None
+
+        # Retry-After is either a number of seconds, or an http date
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            pass
+
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+        except (TypeError, ValueError):
+            return None
+
+    def delay(self, retries_so_far, response=None):
+
+        retry_after = self._retry_after(response)
+
+        # a server can ask for any wait at all, so it is capped like any
+        # other backoff
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+
+        # "full jitter": spreading retries randomly across the whole backoff
+        # window stops many clients that failed together retrying together
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff_factor * 2 ** retries_so_far))
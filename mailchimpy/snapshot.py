@@ -0,0 +1,147 @@
+import mmap
+import os
+import struct
+
+from .mailchimpy import _subscriber_hash, _subscription_status
+
+
+# a snapshot file is laid out as:
+#
+#   header    8 byte magic, then the member count as a little endian uint64
+#   hashes    count 16 byte md5 subscriber hashes, in ascending order
+#   statuses  count status bytes, in the same order as the hashes
+#
+# so 5 million members take 85MB, and lookups are a binary search over the
+# mapped file with nothing loaded into memory up front
+MAGIC = b'MCSNAP01'
+HEADER = struct.Struct('<8sQ')
+HASH_SIZE = 16
+
+STATUS_CODES = {
+    'subscribed': 1,
+    'unsubscribed': 2,
+    'cleaned': 3,
+    'pending': 4,
+    'transactional': 5,
+    'archived': 6
+}
+STATUSES = {code: status for status, code in STATUS_CODES.items()}
+
+
+def write_snapshot(path, members):
+
+    # `members` is an iterable of (subscriber hash, status) pairs, with the
+    # hash as the hex string MailChimp returns as a member's id
+    records = sorted(
+        bytes.fromhex(subscriber_hash) + bytes((STATUS_CODES[status],))
+        for subscriber_hash, status in members
+    )
+
+    # write to a temporary file which then replaces the old snapshot, so
+    # that processes still reading the old one are unaffected
+    temp_path = '{}.tmp'.format(path)
+
+    with open(temp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(records)))
+        for record in records:
+            f.write(record[:HASH_SIZE])
+        f.write(bytes(record[HASH_SIZE] for record in records))
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(temp_path, path)
+
+    return len(records)
+
+
+def build_snapshot(client, list_id, path, status=None):
+
+    return write_snapshot(path, (
+        (member['id'], member['status'])
+        for member in client.iter_list_members(
+            list_id, status=status, fields=['id', 'status'])
+    ))
+
+
+class Snapshot(object):
+
+    def __init__(self, path):
+
+        # the mapping stays valid once the file is closed, and is shared
+        # with every other process mapping the same snapshot
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.count = HEADER.unpack_from(self._mmap)
+
+        if magic != MAGIC:
+            raise Exception('Not a subscriber snapshot: {}'.format(path))
+
+        if len(self._mmap) != HEADER.size + self.count * (HASH_SIZE + 1):
+            raise Exception('Truncated subscriber snapshot: {}'.format(path))
+
+        self._statuses_offset = HEADER.size + self.count * HASH_SIZE
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        self.close()
+
+    def __len__(self):
+
+        return self.count
+
+    def __contains__(self, email):
+
+        return self._find(bytes.fromhex(_subscriber_hash(email))) is not None
+
+    def _find(self, digest):
+
+        low, high = 0, self.count
+
+        while low < high:
+            middle = (low + high) // 2
+            offset = HEADER.size + middle * HASH_SIZE
+            candidate = self._mmap[offset:offset + HASH_SIZE]
+
+            if candidate < digest:
+                low = middle + 1
+            elif candidate > digest:
+                high = middle
+            else:
+                return middle
+
+        return None
+
+    def _status(self, digest):
+
+        index = self._find(digest)
+
+        if index is None:
+            return None
+
+        return STATUSES.get(self._mmap[self._statuses_offset + index])
+
+    def status_for_hash(self, subscriber_hash):
+
+        return self._status(bytes.fromhex(subscriber_hash))
+
+    def status(self, email):
+
+        return self.status_for_hash(_subscriber_hash(email))
+
+    def check_subscription_status(self, email):
+
+        status = self.status(email)
+
+        if status is None:
+            return _subscription_status(404, None)
+
+        return _subscription_status(200, {'status': status})
+
+    def close(self):
+
+        self._mmap.close()
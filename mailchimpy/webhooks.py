@@ -0,0 +1,210 @@
+import threading
+from collections import deque, namedtuple
+from urllib.parse import parse_qs
+
+from .mailchimpy import _subscriber_hash, _subscription_status
+
+
+# a single webhook event. `new_email` is only set for upemail events, and
+# `action` only for unsubscribes, where 'delete' means the member was
+# deleted from the list rather than unsubscribed
+WebhookEvent = namedtuple(
+    'WebhookEvent', ['type', 'list_id', 'email', 'new_email', 'action', 'fired_at'])
+
+
+class EVENT_TYPE():
+    SUBSCRIBE = 'subscribe'
+    UNSUBSCRIBE = 'unsubscribe'
+    PROFILE = 'profile'
+    CLEANED = 'cleaned'
+    UPEMAIL = 'upemail'
+
+
+def parse_event(body):
+
+    # webhooks are posted form encoded, with nested values flattened into
+    # keys like data[email]
+    fields = {
+        key: values[0]
+        for key, values in parse_qs(body.decode('utf-8')).items()
+    }
+
+    event_type = fields.get('type')
+
+    if event_type == EVENT_TYPE.UPEMAIL:
+        email = fields.get('data[old_email]')
+    else:
+        email = fields.get('data[email]')
+
+    if event_type is None or email is None or 'data[list_id]' not in fields:
+        raise ValueError('Not a MailChimp webhook event')
+
+    if event_type == EVENT_TYPE.UPEMAIL and fields.get('data[new_email]') is None:
+        raise ValueError('Not a MailChimp webhook event')
+
+    return WebhookEvent(
+        event_type,
+        fields['data[list_id]'],
+        email,
+        fields.get('data[new_email]'),
+        fields.get('data[action]'),
+        fields.get('fired_at')
+    )
+
+
+class StatusTable(object):
+
+    # marks a member known not to be on a list, as opposed to one we have
+    # simply not heard about
+    DELETED = None
+
+    def __init__(self):
+
+        # list_id -> {subscriber hash: status}
+        self._lists = {}
+        self._lock = threading.Lock()
+
+        # events are queued as they arrive, and applied together under a
+        # single lock acquisition the next time the table is read
+        self._pending = deque()
+
+    def load(self, list_id, members):
+
+        # seed a list from (subscriber hash, status) pairs, e.g. from
+        # iter_list_members, so that its lookups are authoritative
+        with self._lock:
+            statuses = self._lists.setdefault(list_id, {})
+            for subscriber_hash, status in members:
+                statuses[subscriber_hash] = status
+
+    def queue(self, event):
+
+        self._pending.append(event)
+
+    def apply_pending(self):
+
+        with self._lock:
+            while self._pending:
+                self._apply(self._pending.popleft())
+
+    def _apply(self, event):
+
+        statuses = self._lists.setdefault(event.list_id, {})
+        subscriber_hash = _subscriber_hash(event.email)
+
+        if event.type == EVENT_TYPE.SUBSCRIBE:
+            statuses[subscriber_hash] = 'subscribed'
+        elif event.type == EVENT_TYPE.UNSUBSCRIBE:
+            if event.action == 'delete':
+                statuses[subscriber_hash] = self.DELETED
+            else:
+                statuses[subscriber_hash] = 'unsubscribed'
+        elif event.type == EVENT_TYPE.CLEANED:
+            statuses[subscriber_hash] = 'cleaned'
+        elif event.type == EVENT_TYPE.PROFILE:
+            # profile updates are only sent for subscribed members
+            statuses.setdefault(subscriber_hash, 'subscribed')
+        elif event.type == EVENT_TYPE.UPEMAIL:
+            # hash the new address before changing anything, so that a bad
+            # event can't leave the old address deleted and the new one
+            # unknown
+            new_subscriber_hash = _subscriber_hash(event.new_email)
+            status = statuses.get(subscriber_hash) or 'subscribed'
+            statuses[subscriber_hash] = self.DELETED
+            statuses[new_subscriber_hash] = status
+
+    def check_subscription_status(self, email, list_id):
+
+        # returns None when nothing is known about the member, in which
+        # case the caller should fall back to asking the api
+        self.apply_pending()
+
+        statuses = self._lists.get(list_id)
+        subscriber_hash = _subscriber_hash(email)
+
+        if statuses is None or subscriber_hash not in statuses:
+            return None
+
+        status = statuses[subscriber_hash]
+
+        if status is self.DELETED:
+            return _subscription_status(404, None)
+
+        return _subscription_status(200, {'status': status})
+
+
+class WebhookApp(object):
+
+    # a WSGI application receiving MailChimp webhooks into a StatusTable.
+    # when `secret` is set, the webhook url must carry it as ?secret=...
+
+    def __init__(self, table, secret=None):
+
+        self.table = table
+        self.secret = secret
+
+    def handle(self, method, query_string, body):
+
+        # returns an http status line for the request
+        if self.secret is not None and \
+                parse_qs(query_string).get('secret', [None])[0] != self.secret:
+            return '403 Forbidden'
+
+        # MailChimp checks that a webhook url exists with a GET before
+        # sending it any events
+        if method in ('GET', 'HEAD'):
+            return '200 OK'
+
+        if method != 'POST':
+            return '405 Method Not Allowed'
+
+        try:
+            self.table.queue(parse_event(body))
+        except (ValueError, UnicodeDecodeError):
+            return '400 Bad Request'
+
+        return '200 OK'
+
+    def __call__(self, environ, start_response):
+
+        try:
+            length = int(environ.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            length = 0
+
+        status = self.handle(
+            environ['REQUEST_METHOD'],
+            environ.get('QUERY_STRING', ''),
+            environ['wsgi.input'].read(length) if length else b''
+        )
+
+        start_response(status, [('Content-Type', 'text/plain')])
+
+        return [status.encode()]
+
+
+class AsyncWebhookApp(WebhookApp):
+
+    # the same webhook receiver, as an ASGI application
+
+    async def __call__(self, scope, receive, send):
+
+        if scope['type'] != 'http':
+            return
+
+        body = b''
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get('body', b'')
+            more_body = message.get('more_body', False)
+
+        status = self.handle(
+            scope['method'], scope.get('query_string', b'').decode(), body)
+
+        await send({
+            'type': 'http.response.start',
+            'status': int(status.split()[0]),
+            'headers': [(b'content-type', b'text/plain')]
+        })
+        await send({'type': 'http.response.body', 'body': status.encode()})
@@ -0,0 +1,174 @@
+import threading
+from collections import OrderedDict
+
+from .mailchimpy import MailChimpClient
+
+
+class WriteBehindQueue(object):
+
+    def __init__(self, client, max_batch_size=500, flush_interval=1.0, max_attempts=5):
+
+        self.client = client
+
+        # pending writes are flushed once this many have built up, or
+        # `flush_interval` seconds after the last flush, whichever is first
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+
+        # (list_id, lower cased email) -> (email, status). writing the same
+        # member again replaces its pending write, so only the last wins
+        self._pending = OrderedDict()
+
+        # writes the api turned away are re-queued, and given up on after
+        # failing `max_attempts` flushes. this maps each re-queued write's
+        # key to the number of flushes it has failed
+        self.max_attempts = max_attempts
+        self._attempts = {}
+
+        self._condition = threading.Condition()
+
+        # only one flush may talk to the api at a time, so that writes for
+        # the same member can't be sent out of order
+        self._flush_lock = threading.Lock()
+
+        self.enqueued = 0
+        self.coalesced = 0
+        self.flushed = 0
+        self.errors = 0
+        self.last_error = None
+
+        self.closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def depth(self):
+
+        return len(self._pending)
+
+    def set_subscription(self, email, list_id, status):
+
+        with self._condition:
+
+            if self.closed:
+                raise Exception('Queue has been drained')
+
+            key = (list_id, email.lower())
+
+            if key in self._pending:
+                del self._pending[key]
+                self.coalesced += 1
+
+            # a new write starts with a clean slate
+            self._pending[key] = (email, status)
+            self._attempts.pop(key, None)
+            self.enqueued += 1
+
+            if len(self._pending) >= self.max_batch_size:
+                self._condition.notify()
+
+    def subscribe_email_to_list(self, email, list_id):
+
+        self.set_subscription(email, list_id, MailChimpClient.MEMBER_STATUS.SUBSCRIBED)
+
+    def unsubscribe_email_from_list(self, email, list_id):
+
+        self.set_subscription(email, list_id, MailChimpClient.MEMBER_STATUS.UNSUBSCRIBED)
+
+    def flush(self):
+
+        with self._flush_lock:
+
+            with self._condition:
+                batch, self._pending = self._pending, OrderedDict()
+
+            subscriptions_by_list = OrderedDict()
+            for (list_id, _), subscription in batch.items():
+                subscriptions_by_list.setdefault(list_id, []).append(subscription)
+
+            try:
+                for list_id, subscriptions in subscriptions_by_list.items():
+                    report = self.client.set_subscriptions(subscriptions, list_id)
+                    rejected = set(email.lower() for email in report['rejected'])
+
+                    self.flushed += len(subscriptions) - len(rejected)
+                    self.errors += len(report['errors']) - len(rejected)
+
+                    # these writes are done with, and mustn't be re-queued
+                    # if a later list fails. writes the api turned away whole
+                    # are left in the batch, to be re-queued below
+                    for email, status in subscriptions:
+                        if email.lower() not in rejected:
+                            batch.pop((list_id, email.lower()), None)
+                            with self._condition:
+                                self._attempts.pop((list_id, email.lower()), None)
+
+                    if rejected:
+                        raise Exception('Unexpected API response: http status code')
+            except Exception:
+                # put back whatever wasn't sent, unless it has since been
+                # superseded by a newer write for the same member, or has
+                # now failed too often to be worth trying again
+                with self._condition:
+                    for key, subscription in batch.items():
+                        if key in self._pending:
+                            continue
+                        attempts = self._attempts.get(key, 0) + 1
+                        if attempts >= self.max_attempts:
+                            self._attempts.pop(key, None)
+                            self.errors += 1
+                        else:
+                            self._attempts[key] = attempts
+                            self._pending[key] = subscription
+                raise
+
+    def _run(self):
+
+        failed = False
+
+        while True:
+
+            with self._condition:
+                if failed:
+                    # after a failed flush the re-queued writes may well
+                    # fill a batch straight away, so wait out the interval
+                    # rather than sending them again at once
+                    self._condition.wait_for(
+                        lambda: self.closed, timeout=self.flush_interval)
+                else:
+                    self._condition.wait_for(
+                        lambda: self.closed or len(self._pending) >= self.max_batch_size,
+                        timeout=self.flush_interval)
+
+                if self.closed:
+                    return
+
+            failed = False
+            if self._pending:
+                try:
+                    self.flush()
+                except Exception as e:
+                    # the writes were re-queued, and will be tried again at
+                    # the next flush
+                    self.last_error = e
+                    failed = True
+
+    def drain(self):
+
+        # stop the background writer, then send everything still queued
+        with self._condition:
+            self.closed = True
+            self._condition.notify()
+
+        self._thread.join()
+        self.flush()
+
+    def stats(self):
+
+        return {
+            'depth': self.depth,
+            'enqueued': self.enqueued,
+            'coalesced': self.coalesced,
+            'flushed': self.flushed,
+            'errors': self.errors
+        }
@@ -0,0 +1,124 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase, skipIf
+
+from mailchimpy.fakeserver import FakeMailChimpServer
+from mailchimpy.mailchimpy import MailChimpClient
+from mailchimpy.retry import RetryPolicy
+
+try:
+    from mailchimpy.asyncclient import AsyncMailChimpClient
+except ImportError:
+    # aiohttp is only required by the async client
+    AsyncMailChimpClient = None
+
+
+@skipIf(AsyncMailChimpClient is None, 'aiohttp is not installed')
+class AsyncMailChimpClientTest(IsolatedAsyncioTestCase):
+
+    # every result is checked against the synchronous client's, which the
+    # async client must match
+
+    def setUp(self):
+
+        self.server = FakeMailChimpServer().start()
+        self.sync_client = MailChimpClient(
+            'apikey-us1', api_root=self.server.api_root,
+            retry_policy=RetryPolicy(max_retries=0))
+
+    async def asyncSetUp(self):
+
+        self.client = AsyncMailChimpClient('apikey-us1', api_root=self.server.api_root)
+
+    async def asyncTearDown(self):
+
+        await self.client.close()
+
+    def tearDown(self):
+
+        self.server.stop()
+
+    async def test_get_api_root(self):
+
+        response = await self.client.get_api_root(fields=('account_id',))
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(await response.json(), {'account_id': 'fake'})
+
+    async def test_check_subscription_status(self):
+
+        self.server.add_member('list', 'subscribed@example.com')
+        self.server.add_member('list', 'unsubscribed@example.com', 'unsubscribed')
+
+        for email in ['subscribed@example.com', 'Unsubscribed@Example.com',
+                      'nobody@example.com']:
+            self.assertEqual(
+                await self.client.check_subscription_status(email, 'list'),
+                self.sync_client.check_subscription_status(email, 'list'))
+
+        self.assertEqual(
+            await self.client.check_subscription_status('subscribed@example.com', 'list'),
+            (True, True))
+        self.assertEqual(
+            await self.client.check_subscription_status('unsubscribed@example.com', 'list'),
+            (True, False))
+        self.assertEqual(
+            await self.client.check_subscription_status('nobody@example.com', 'list'),
+            (False, None))
+
+    async def test_subscribe_email_to_list(self):
+
+        self.assertIs(
+            await self.client.subscribe_email_to_list('a@example.com', 'list'), True)
+        # already a member
+        self.assertIs(
+            await self.client.subscribe_email_to_list('a@example.com', 'list'), False)
+        self.assertIs(
+            self.sync_client.subscribe_email_to_list('a@example.com', 'list'), False)
+
+        self.server.error_rate = 1.0
+
+        self.assertIsNone(await self.client.subscribe_email_to_list('b@example.com', 'list'))
+        self.assertIsNone(self.sync_client.subscribe_email_to_list('b@example.com', 'list'))
+
+    async def test_unsubscribe_email_from_list(self):
+
+        self.server.add_member('list', 'a@example.com')
+
+        self.assertIs(
+            await self.client.unsubscribe_email_from_list('a@example.com', 'list'), True)
+        self.assertEqual(
+            self.sync_client.check_subscription_status('a@example.com', 'list'), (True, False))
+        self.assertIsNone(
+            await self.client.unsubscribe_email_from_list('b@example.com', 'list'))
+        self.assertIsNone(
+            self.sync_client.unsubscribe_email_from_list('b@example.com', 'list'))
+
+        self.server.error_rate = 1.0
+
+        self.assertIs(
+            await self.client.unsubscribe_email_from_list('a@example.com', 'list'), False)
+        self.assertIs(
+            self.sync_client.unsubscribe_email_from_list('a@example.com', 'list'), False)
+
+    async def test_interest_categories(self):
+
+        self.assertIs(await self.client.create_interest_category('Colours', 'list'), True)
+
+        category_id = self.sync_client._request(
+            'GET', 'lists/{}/interest-categories', 'list').json()['categories'][0]['id']
+
+        self.assertIs(await self.client.get_interest_category(category_id, 'list'), True)
+        self.assertIs(self.sync_client.get_interest_category(category_id, 'list'), True)
+        self.assertIs(await self.client.get_interest_category('missing', 'list'), False)
+
+    async def test_concurrent_requests_share_the_session(self):
+
+        emails = ['{}@example.com'.format(i) for i in range(50)]
+
+        results = await asyncio.gather(*[
+            self.client.subscribe_email_to_list(email, 'list') for email in emails])
+
+        self.assertEqual(results, [True] * 50)
+        self.assertEqual(
+            self.sync_client.check_subscription_status_many(emails, 'list'),
+            {email: (True, True) for email in emails})
@@ -0,0 +1,54 @@
+import time
+from unittest import TestCase
+
+from mailchimpy.cache import SubscriptionCache
+
+
+class SubscriptionCacheTest(TestCase):
+
+    def test_get_returns_missing_for_unknown_key(self):
+
+        cache = SubscriptionCache()
+
+        self.assertIs(cache.get(('list', 'hash')), cache.MISSING)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_get_returns_value_that_was_set(self):
+
+        cache = SubscriptionCache()
+        cache.set(('list', 'hash'), (False, None))
+
+        self.assertEqual(cache.get(('list', 'hash')), (False, None))
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_entries_expire_after_ttl(self):
+
+        cache = SubscriptionCache(ttl=0.01)
+        cache.set(('list', 'hash'), (True, True))
+
+        time.sleep(0.02)
+
+        self.assertIs(cache.get(('list', 'hash')), cache.MISSING)
+        self.assertEqual(len(cache), 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+
+        cache = SubscriptionCache(maxsize=2)
+        cache.set('a', (True, True))
+        cache.set('b', (True, True))
+
+        # touch 'a', so that 'b' becomes the least recently used
+        cache.get('a')
+        cache.set('c', (True, True))
+
+        self.assertIs(cache.get('b'), cache.MISSING)
+        self.assertEqual(cache.get('a'), (True, True))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_invalidate_removes_entry(self):
+
+        cache = SubscriptionCache()
+        cache.set('a', (True, True))
+        cache.invalidate('a')
+
+        self.assertIs(cache.get('a'), cache.MISSING)
@@ -0,0 +1,77 @@
+import io
+import json
+from unittest import TestCase
+
+from mailchimpy.exporter import export_members
+from mailchimpy.fakeserver import FakeMailChimpServer, uniform
+from mailchimpy.mailchimpy import MailChimpClient
+
+
+class ExportMembersTest(TestCase):
+
+    def setUp(self):
+
+        # random latency, so that concurrently requested pages complete
+        # out of order
+        self.server = FakeMailChimpServer(latency=uniform(0, 0.01)).start()
+        self.client = MailChimpClient('apikey-us1', api_root=self.server.api_root)
+
+    def tearDown(self):
+
+        self.server.stop()
+
+    def _add_members(self, count):
+
+        for i in range(count):
+            member = self.server.add_member('list', '{}@example.com'.format(i))
+            member['merge_fields'] = {'FNAME': str(i)}
+
+    def test_ndjson_export_is_in_list_order(self):
+
+        self._add_members(1234)
+        out = io.StringIO()
+
+        exported = export_members(
+            self.client, 'list', out, fields=['email_address', 'status'],
+            page_size=100, concurrency=5)
+
+        self.assertEqual(exported, 1234)
+        self.assertEqual(
+            [json.loads(line) for line in out.getvalue().splitlines()],
+            [{'email_address': '{}@example.com'.format(i), 'status': 'subscribed'}
+             for i in range(1234)])
+
+    def test_csv_export_writes_requested_fields(self):
+
+        self._add_members(2)
+        out = io.StringIO()
+
+        export_members(
+            self.client, 'list', out, output_format='csv',
+            fields=['email_address', 'merge_fields.FNAME'])
+
+        self.assertEqual(out.getvalue().splitlines(), [
+            'email_address,merge_fields.FNAME',
+            '0@example.com,0',
+            '1@example.com,1'
+        ])
+
+    def test_export_by_status(self):
+
+        self._add_members(3)
+        self.server.add_member('list', '1@example.com', 'unsubscribed')
+        out = io.StringIO()
+
+        exported = export_members(
+            self.client, 'list', out, output_format='csv', status='unsubscribed')
+
+        self.assertEqual(exported, 1)
+        self.assertEqual(out.getvalue().splitlines()[1].split(',')[1:], [
+            '1@example.com', 'unsubscribed'])
+
+    def test_empty_list(self):
+
+        out = io.StringIO()
+
+        self.assertEqual(export_members(self.client, 'list', out), 0)
+        self.assertEqual(out.getvalue(), '')
@@ -0,0 +1,165 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from mailchimpy.batch import BatchJob
+from mailchimpy.fakeserver import FakeMailChimpServer
+from mailchimpy.mailchimpy import MailChimpClient, _subscriber_hash
+from mailchimpy.retry import RetryPolicy
+
+
+class FakeMailChimpServerTest(TestCase):
+
+    def setUp(self):
+
+        self.server = FakeMailChimpServer().start()
+        self.client = MailChimpClient('apikey-us1', api_root=self.server.api_root)
+
+    def tearDown(self):
+
+        self.server.stop()
+
+    def test_subscribe_and_check_subscription_status(self):
+
+        self.assertTrue(self.client.subscribe_email_to_list('Someone@example.com', 'list'))
+
+        self.assertEqual(
+            self.client.check_subscription_status('someone@example.com', 'list'),
+            (True, True))
+        self.assertEqual(
+            self.client.check_subscription_status('nobody@example.com', 'list'),
+            (False, None))
+
+    def test_subscribing_an_existing_member_fails(self):
+
+        self.server.add_member('list', 'someone@example.com')
+
+        self.assertFalse(self.client.subscribe_email_to_list('someone@example.com', 'list'))
+
+    def test_unsubscribe(self):
+
+        self.server.add_member('list', 'someone@example.com')
+
+        self.assertTrue(self.client.unsubscribe_email_from_list('someone@example.com', 'list'))
+        self.assertEqual(
+            self.client.check_subscription_status('someone@example.com', 'list'),
+            (True, False))
+
+    def test_member_paths_ignore_the_case_of_emails(self):
+
+        self.assertTrue(self.client.set_subscription(
+            'Someone@Example.com', 'list', MailChimpClient.MEMBER_STATUS.UNSUBSCRIBED))
+
+        self.assertEqual(
+            self.client.check_subscription_status('SOMEONE@example.com', 'list'),
+            (True, False))
+        self.assertEqual(
+            self.client.check_subscription_status_many(
+                ['Someone@Example.com', 'someone@example.com'], 'list', batch_threshold=1),
+            {'Someone@Example.com': (True, False), 'someone@example.com': (True, False)})
+
+    def test_iter_list_members_pages_through_the_list(self):
+
+        for i in range(25):
+            self.server.add_member('list', '{}@example.com'.format(i))
+
+        members = list(self.client.iter_list_members(
+            'list', fields=('email_address', 'status'), page_size=10))
+
+        self.assertEqual(len(members), 25)
+        self.assertEqual(members[0], {'email_address': '0@example.com', 'status': 'subscribed'})
+
+    def test_reconcile(self):
+
+        self.server.add_member('list', 'a@example.com')
+        self.server.add_member('list', 'b@example.com')
+        self.server.add_member('list', 'c@example.com')
+        self.server.add_member('list', 'd@example.com', 'unsubscribed')
+
+        # b is already subscribed under another case, and e is given twice
+        report = self.client.reconcile('list', [
+            'a@example.com', ' B@Example.com', 'D@example.com',
+            'e@example.com', 'E@example.com'])
+
+        self.assertEqual(
+            (report['subscribe'], report['unsubscribe'], report['unchanged']), (2, 1, 2))
+        self.assertEqual(report['subscribed']['new'], ['e@example.com'])
+        self.assertEqual(report['subscribed']['updated'], ['d@example.com'])
+        self.assertEqual(report['subscribed']['errors'], [])
+        self.assertEqual(report['unsubscribed']['updated'], ['c@example.com'])
+        self.assertEqual(report['unsubscribed']['errors'], [])
+
+        self.assertEqual(
+            self.client.check_subscription_status_many(
+                ['a@example.com', 'b@example.com', 'c@example.com',
+                 'd@example.com', 'e@example.com'], 'list'),
+            {'a@example.com': (True, True), 'b@example.com': (True, True),
+             'c@example.com': (True, False), 'd@example.com': (True, True),
+             'e@example.com': (True, True)})
+        self.assertEqual(len(self.server.lists['list']['members']), 5)
+
+        # the list now matches, so there is nothing left to do
+        self.assertEqual(
+            self.client.reconcile('list', ['a@example.com', 'b@example.com',
+                                           'd@example.com', 'e@example.com'], dry_run=True),
+            {'subscribe': 0, 'unsubscribe': 0, 'unchanged': 4})
+
+    def test_set_member_interests_bulk_collapses_case_variants(self):
+
+        self.server.add_member('list', 'a@example.com')
+        self.server.add_member('list', 'b@example.com')
+
+        results = self.client.set_member_interests_bulk('list', {
+            'A@Example.com': {'1': False, '2': True},
+            'b@example.com': {'1': True},
+            'a@example.com': {'1': True},
+            'nobody@example.com': {'1': True}
+        })
+
+        self.assertEqual(results, {
+            'A@Example.com': True, 'b@example.com': True,
+            'a@example.com': True, 'nobody@example.com': False
+        })
+        # only the last change given for a was sent
+        self.assertEqual(
+            self.server.lists['list']['members'][_subscriber_hash('a@example.com')]['interests'],
+            {'1': True})
+
+    def test_batch_job(self):
+
+        self.server.add_member('list', 'someone@example.com')
+
+        job = BatchJob(self.client)
+        job.check_subscription_status('someone@example.com', 'list', operation_id='exists')
+        job.check_subscription_status('nobody@example.com', 'list', operation_id='missing')
+        results = {result.operation_id: result for result in job.run(poll_interval=0)}
+
+        self.assertEqual(results['exists'].status_code, 200)
+        self.assertEqual(results['exists'].response, {'status': 'subscribed'})
+        self.assertEqual(results['missing'].status_code, 404)
+
+    def test_requests_beyond_max_connections_are_throttled(self):
+
+        self.server.stop()
+        self.server = FakeMailChimpServer(latency=0.1, max_connections=2).start()
+        client = MailChimpClient(
+            'apikey-us1', api_root=self.server.api_root,
+            retry_policy=RetryPolicy(max_retries=0))
+
+        with ThreadPoolExecutor(6) as executor:
+            status_codes = list(executor.map(
+                lambda _: client._request('GET', '').status_code, range(6)))
+
+        self.assertIn(429, status_codes)
+        self.assertEqual(self.server.stats()['throttled'], status_codes.count(429))
+
+    def test_faults_are_retried(self):
+
+        self.server.error_rate = 0.5
+        client = MailChimpClient(
+            'apikey-us1', api_root=self.server.api_root,
+            retry_policy=RetryPolicy(max_retries=20, backoff_factor=0.001))
+
+        for _ in range(10):
+            self.assertEqual(client._request('GET', '').status_code, 200)
+
+        self.assertEqual(self.server.stats()['requests'], 10 + self.server.stats()['faults'])
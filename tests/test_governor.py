@@ -0,0 +1,154 @@
+import multiprocessing
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from mailchimpy.fakeserver import FakeMailChimpServer
+from mailchimpy.governor import ConcurrencyGovernor
+from mailchimpy.mailchimpy import MailChimpClient
+from mailchimpy.retry import RetryPolicy
+
+
+def _governed_requests(api_root, lock_dir, requests, barrier, results):
+
+    # run in a separate process, with its own client and governor, making
+    # `requests` requests from as many threads once every process is ready
+    governor = ConcurrencyGovernor(max_concurrent=3, lock_dir=lock_dir, api_key='apikey-us1')
+    client = MailChimpClient(
+        'apikey-us1', api_root=api_root, governor=governor,
+        retry_policy=RetryPolicy(max_retries=0))
+
+    barrier.wait()
+    with ThreadPoolExecutor(requests) as executor:
+        status_codes = list(executor.map(
+            lambda _: client.get_api_root().status_code, range(requests)))
+
+    governor.close()
+    results.put(status_codes)
+
+
+class ConcurrencyGovernorTest(TestCase):
+
+    def _peak_concurrency(self, governor, threads=20):
+
+        lock = threading.Lock()
+        counts = {'in_flight': 0, 'peak': 0}
+
+        def request():
+            with governor.slot():
+                with lock:
+                    counts['in_flight'] += 1
+                    counts['peak'] = max(counts['peak'], counts['in_flight'])
+                time.sleep(0.01)
+                with lock:
+                    counts['in_flight'] -= 1
+
+        workers = [threading.Thread(target=request) for i in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        return counts['peak']
+
+    def test_slots_cap_requests_in_flight(self):
+
+        governor = ConcurrencyGovernor(max_concurrent=3)
+
+        self.assertLessEqual(self._peak_concurrency(governor), 3)
+
+    def test_lock_files_cap_requests_in_flight(self):
+
+        with tempfile.TemporaryDirectory() as lock_dir:
+            governor = ConcurrencyGovernor(
+                max_concurrent=3, lock_dir=lock_dir, api_key='key-us1')
+
+            self.assertLessEqual(self._peak_concurrency(governor), 3)
+
+            governor.close()
+
+    def test_token_bucket_limits_sustained_rate(self):
+
+        governor = ConcurrencyGovernor(rate=100, burst=1)
+
+        started = time.monotonic()
+        for i in range(11):
+            with governor.slot():
+                pass
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+    def test_rates_below_one_per_second_let_requests_through(self):
+
+        governor = ConcurrencyGovernor(rate=0.5)
+
+        # the bucket starts with a whole token, so the first request goes
+        # straight through instead of waiting forever
+        started = time.monotonic()
+        with governor.slot():
+            pass
+
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(governor.bucket.capacity, 1)
+
+
+class GovernedClientTest(TestCase):
+
+    # the fake api allows one more connection than the governors, so that
+    # a slot freed just before the api has finished with its request
+    # doesn't count against the next one
+    def setUp(self):
+
+        self.server = FakeMailChimpServer(latency=0.02, max_connections=4).start()
+
+    def tearDown(self):
+
+        self.server.stop()
+
+    def _run_processes(self, lock_dir, processes=2, requests=12):
+
+        # returns the statuses of every request made by every process
+        barrier = multiprocessing.Barrier(processes)
+        results = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(
+                target=_governed_requests,
+                args=(self.server.api_root, lock_dir, requests, barrier, results))
+            for i in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        status_codes = [code for _ in workers for code in results.get(timeout=30)]
+        for worker in workers:
+            worker.join()
+
+        return status_codes
+
+    def test_governed_client_is_not_throttled(self):
+
+        client = MailChimpClient(
+            'apikey-us1', api_root=self.server.api_root,
+            governor=ConcurrencyGovernor(max_concurrent=3),
+            retry_policy=RetryPolicy(max_retries=0))
+
+        with ThreadPoolExecutor(12) as executor:
+            status_codes = list(executor.map(
+                lambda _: client.get_api_root().status_code, range(36)))
+
+        self.assertEqual(status_codes, [200] * 36)
+        self.assertEqual(self.server.stats()['throttled'], 0)
+
+    def test_processes_sharing_a_lock_dir_are_not_throttled(self):
+
+        with tempfile.TemporaryDirectory() as lock_dir:
+            status_codes = self._run_processes(lock_dir)
+
+        self.assertEqual(status_codes, [200] * 24)
+        self.assertEqual(self.server.stats()['throttled'], 0)
+
+    def test_processes_without_a_lock_dir_are_throttled(self):
+
+        # each process only governs itself, so together they exceed the cap
+        self.assertIn(429, self._run_processes(None))
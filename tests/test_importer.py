@@ -0,0 +1,183 @@
+import hashlib
+import os
+import tempfile
+from unittest import TestCase
+
+from mailchimpy.fakeserver import FakeMailChimpServer
+from mailchimpy.importer import (
+    BoundedSeenSet, Checkpoint, import_emails, normalize_emails, read_emails)
+from mailchimpy.mailchimpy import MailChimpClient
+from mailchimpy.metrics import RequestHooks
+from mailchimpy.retry import RetryPolicy
+
+
+class ImporterTest(TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+
+        self.directory.cleanup()
+
+    def _write(self, name, content):
+
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_read_emails_from_csv(self):
+
+        path = self._write('contacts.csv', 'name,email\na,a@example.com\nb,\n')
+
+        self.assertEqual(list(read_emails(path)), ['a@example.com', ''])
+
+    def test_read_emails_from_ndjson(self):
+
+        path = self._write(
+            'contacts.ndjson', '{"email": "a@example.com"}\n\n{"name": "b"}\n')
+
+        self.assertEqual(list(read_emails(path)), ['a@example.com', None])
+
+    def test_normalize_emails_lower_cases_hashes_and_drops_invalid(self):
+
+        self.assertEqual(
+            normalize_emails([' A@Example.com ', 'invalid', None]),
+            [('a@example.com', hashlib.md5(b'a@example.com').digest())])
+
+    def test_bounded_seen_set_lets_everything_through_once_full(self):
+
+        seen = BoundedSeenSet(1)
+
+        self.assertTrue(seen.add(b'a'))
+        self.assertFalse(seen.add(b'a'))
+        self.assertTrue(seen.add(b'b'))
+        self.assertTrue(seen.add(b'b'))
+
+    def test_checkpoint_round_trip(self):
+
+        checkpoint = Checkpoint(os.path.join(self.directory.name, 'checkpoint'))
+
+        self.assertEqual(checkpoint.load(), 0)
+        checkpoint.save(1500)
+        self.assertEqual(checkpoint.load(), 1500)
+
+
+class FailRequests(RequestHooks):
+
+    # makes the fake api fail the requests numbered in `failing`
+    def __init__(self, server, failing):
+
+        self.server = server
+        self.failing = failing
+        self.requests = 0
+
+    def on_request_start(self, event):
+
+        self.requests += 1
+        self.server.error_rate = 1.0 if self.requests in self.failing else 0.0
+
+
+class ImportEmailsTest(TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'contacts.csv')
+        self.checkpoint_path = os.path.join(self.directory.name, 'contacts.checkpoint')
+
+        with open(self.path, 'w') as f:
+            f.write('email\n')
+            for i in range(10):
+                f.write('Contact-{}@Example.com\n'.format(i))
+            f.write('contact-0@example.com\nnot an email\n')
+
+        self.server = FakeMailChimpServer().start()
+
+    def tearDown(self):
+
+        self.server.stop()
+        self.directory.cleanup()
+
+    def _client(self, hooks=()):
+
+        return MailChimpClient(
+            'apikey-us1', api_root=self.server.api_root, hooks=hooks,
+            retry_policy=RetryPolicy(max_retries=0))
+
+    def _import(self, client, update_existing=False):
+
+        return import_emails(
+            client, 'list', self.path, chunk_size=2, parallel=1, processes=2,
+            checkpoint_path=self.checkpoint_path, update_existing=update_existing,
+            out=None)
+
+    def test_import(self):
+
+        stats = self._import(self._client())
+
+        self.assertEqual(stats, {
+            'records': 12, 'duplicates': 1, 'invalid': 1,
+            'new': 10, 'updated': 0, 'errors': 0, 'rejected': 0
+        })
+        self.assertEqual(Checkpoint(self.checkpoint_path).load(), 12)
+        self.assertEqual(
+            self._client().check_subscription_status('contact-9@example.com', 'list'),
+            (True, True))
+
+    def test_existing_members_are_left_alone(self):
+
+        self.server.add_member('list', 'contact-1@example.com', 'unsubscribed')
+
+        stats = self._import(self._client())
+
+        self.assertEqual(stats['new'], 9)
+        self.assertEqual(stats['errors'], 1)
+        self.assertEqual(
+            self._client().check_subscription_status('contact-1@example.com', 'list'),
+            (True, False))
+
+    def test_existing_members_are_updated_when_asked(self):
+
+        self.server.add_member('list', 'contact-1@example.com', 'unsubscribed')
+
+        stats = self._import(self._client(), update_existing=True)
+
+        self.assertEqual(stats['updated'], 1)
+        self.assertEqual(stats['errors'], 0)
+        self.assertEqual(
+            self._client().check_subscription_status('contact-1@example.com', 'list'),
+            (True, True))
+
+    def test_resuming_retries_rejected_chunks(self):
+
+        # the third chunk of two is rejected, the rest get through
+        stats = self._import(
+            self._client([FailRequests(self.server, {3})]), update_existing=True)
+
+        self.assertEqual(stats['rejected'], 2)
+        self.assertEqual(stats['new'], 8)
+        self.assertEqual(Checkpoint(self.checkpoint_path).load(), 4)
+
+        stats = self._import(self._client(), update_existing=True)
+
+        self.assertEqual(stats['records'], 12)
+        self.assertEqual(stats['new'], 2)
+        self.assertEqual(stats['rejected'], 0)
+        self.assertEqual(Checkpoint(self.checkpoint_path).load(), 12)
+        self.assertEqual(
+            self._client().check_subscription_status('contact-4@example.com', 'list'),
+            (True, True))
+
+    def test_resuming_without_update_existing_reports_imported_members_as_errors(self):
+
+        self._import(self._client([FailRequests(self.server, {3})]))
+        stats = self._import(self._client())
+
+        # contacts 6 to 9 were imported after the rejected chunk, and
+        # contact-0 is no longer remembered as a duplicate
+        self.assertEqual(stats['new'], 2)
+        self.assertEqual(stats['errors'], 5)
+        self.assertEqual(Checkpoint(self.checkpoint_path).load(), 12)
@@ -6,6 +6,9 @@ from betamax import Betamax
 
 from .basemailchimptest import BaseMailChimpTest
 from mailchimpy.mailchimpy import MailChimpClient
+from mailchimpy.batch import BatchJob
+from mailchimpy.cache import SubscriptionCache
+from mailchimpy.interests import InterestIndex
 from . import config
 
 
@@ -31,6 +34,13 @@ class BaseMailChimpClientTest(BaseMailChimpTest):
 
 class MailChimpClientTest(BaseMailChimpClientTest):
 
+    def test_get_api_root_returns_only_requested_fields(self):
+
+        with self.recorder.use_cassette(self.id()):
+            response = self.mc.get_api_root(fields=['account_id'])
+
+        self.assertEqual(list(response.json().keys()), ['account_id'])
+
     def test_check_subscription_status_for_email_address_that_never_existed_on_list(self):
 
         email = self._get_fresh_email()
@@ -76,6 +86,22 @@ class MailChimpClientTest(BaseMailChimpClientTest):
         self.assertIsNotNone(subscribed)
         self.assertFalse(subscribed)
 
+    def test_check_subscription_status_many_matches_single_lookups(self):
+
+        subscribed_email = self._get_fresh_email()
+        fresh_email = self._get_fresh_email()
+
+        with self.recorder.use_cassette('{}_arrange'.format(self.id())):
+            # subscribe an email address to the list (via API directly)
+            self._api_subscribe_email_to_list(self.temp_list['id'], subscribed_email)
+
+        with self.recorder.use_cassette(self.id()):
+            statuses = self.mc.check_subscription_status_many(
+                [subscribed_email, fresh_email], self.temp_list['id'])
+
+        self.assertEqual(statuses[subscribed_email], (True, True))
+        self.assertEqual(statuses[fresh_email], (False, None))
+
     def test_subscribe_email_to_list_returns_true_on_success(self):
 
         with self.recorder.use_cassette(self.id()):
@@ -100,6 +126,111 @@ class MailChimpClientTest(BaseMailChimpClientTest):
         self.assertIsNotNone(success)
         self.assertFalse(success)
 
+    def test_subscribe_emails_to_list_reports_new_members(self):
+
+        emails = [self._get_fresh_email() for i in range(3)]
+
+        with self.recorder.use_cassette(self.id()):
+            report = self.mc.subscribe_emails_to_list(
+                iter(emails), self.temp_list['id'])
+
+        self.assertEqual(len(report['new']), 3)
+        self.assertEqual(report['updated'], [])
+        self.assertEqual(report['errors'], [])
+
+    def test_subscribe_emails_to_list_reports_errors_for_existing_members(self):
+
+        email = self._get_fresh_email()
+
+        with self.recorder.use_cassette('{}_arrange'.format(self.id())):
+            # subscribe an email address to the list (via API directly)
+            self._api_subscribe_email_to_list(self.temp_list['id'], email)
+
+        with self.recorder.use_cassette(self.id()):
+            report = self.mc.subscribe_emails_to_list(
+                [email, self._get_fresh_email()], self.temp_list['id'])
+
+        self.assertEqual(len(report['new']), 1)
+        self.assertEqual(len(report['errors']), 1)
+
+    def test_set_subscription_subscribes_new_email(self):
+
+        email = self._get_fresh_email()
+
+        with self.recorder.use_cassette(self.id()):
+            success = self.mc.set_subscription(
+                email, self.temp_list['id'], MailChimpClient.MEMBER_STATUS.SUBSCRIBED)
+
+        self.assertTrue(success)
+
+    def test_set_subscription_resubscribes_unsubscribed_email(self):
+
+        email = self._get_fresh_email()
+
+        with self.recorder.use_cassette('{}_arrange_subscription'.format(self.id())):
+            # subscribe an email address to the list (via API directly)
+            self._api_subscribe_email_to_list(self.temp_list['id'], email)
+
+        with self.recorder.use_cassette('{}_arrange_unsubscription'.format(self.id())):
+            # unsubscribe same email address from the list (via API directly)
+            self._api_unsubscribe_email_from_list(email, self.temp_list['id'])
+
+        with self.recorder.use_cassette(self.id()):
+            success = self.mc.set_subscription(
+                email, self.temp_list['id'], MailChimpClient.MEMBER_STATUS.SUBSCRIBED)
+
+        self.assertTrue(success)
+
+    def test_set_subscriptions_creates_and_updates_members(self):
+
+        existing_email = self._get_fresh_email()
+
+        with self.recorder.use_cassette('{}_arrange'.format(self.id())):
+            # subscribe an email address to the list (via API directly)
+            self._api_subscribe_email_to_list(self.temp_list['id'], existing_email)
+
+        with self.recorder.use_cassette(self.id()):
+            report = self.mc.set_subscriptions([
+                (existing_email, MailChimpClient.MEMBER_STATUS.UNSUBSCRIBED),
+                (self._get_fresh_email(), MailChimpClient.MEMBER_STATUS.SUBSCRIBED)
+            ], self.temp_list['id'])
+
+        self.assertEqual(len(report['new']), 1)
+        self.assertEqual(len(report['updated']), 1)
+        self.assertEqual(report['errors'], [])
+
+    def test_reconcile_dry_run_reports_diff_sizes(self):
+
+        kept_email = self._get_fresh_email()
+        removed_email = self._get_fresh_email()
+
+        with self.recorder.use_cassette('{}_arrange'.format(self.id())):
+            for email in (kept_email, removed_email):
+                # subscribe an email address to the list (via API directly)
+                self._api_subscribe_email_to_list(self.temp_list['id'], email)
+
+        with self.recorder.use_cassette(self.id()):
+            report = self.mc.reconcile(
+                self.temp_list['id'], [kept_email, self._get_fresh_email()], dry_run=True)
+
+        self.assertEqual(report, {'subscribe': 1, 'unsubscribe': 1, 'unchanged': 1})
+
+    def test_iter_list_members_pages_through_every_member(self):
+
+        emails = [self._get_fresh_email() for i in range(3)]
+
+        with self.recorder.use_cassette('{}_arrange'.format(self.id())):
+            for email in emails:
+                # subscribe an email address to the list (via API directly)
+                self._api_subscribe_email_to_list(self.temp_list['id'], email)
+
+        with self.recorder.use_cassette(self.id()):
+            members = list(self.mc.iter_list_members(
+                self.temp_list['id'], fields=['email_address'], page_size=2))
+
+        self.assertEqual(len(members), 3)
+        self.assertEqual(set(members[0].keys()), {'email_address'})
+
     def test_unsubscribe_email_from_list_returns_true_on_success(self):
 
         email = self._get_fresh_email()
@@ -174,3 +305,121 @@ class MailChimpClientTest(BaseMailChimpClientTest):
             success = self.mc.get_interest_category(category_id, self.temp_list['id'])
 
         self.assertTrue(success)
+
+    def test_check_subscription_status_is_answered_from_cache_after_unsubscribing(self):
+
+        email = self._get_fresh_email()
+        mc = MailChimpClient(self.api_key, cache=SubscriptionCache())
+        recorder = Betamax(mc.session)
+
+        with self.recorder.use_cassette('{}_arrange'.format(self.id())):
+            # subscribe an email address to the list (via API directly)
+            self._api_subscribe_email_to_list(self.temp_list['id'], email)
+
+        with recorder.use_cassette(self.id()):
+            mc.unsubscribe_email_from_list(email, self.temp_list['id'])
+            (exists, subscribed) = mc.check_subscription_status(email, self.temp_list['id'])
+
+        self.assertTrue(exists)
+        self.assertFalse(subscribed)
+        self.assertEqual(mc.cache.stats()['hits'], 1)
+
+
+class BatchJobTest(BaseMailChimpClientTest):
+
+    def test_batch_job_yields_a_result_for_each_operation(self):
+
+        job = BatchJob(self.mc)
+        subscribe_id = job.subscribe_email_to_list(
+            self._get_fresh_email(), self.temp_list['id'])
+        status_id = job.check_subscription_status(
+            self._get_fresh_email(), self.temp_list['id'])
+
+        with self.recorder.use_cassette(self.id()):
+            results = {
+                result.operation_id: result for result in job.run(poll_interval=5)
+            }
+
+        self.assertEqual(results[subscribe_id].status_code, 200)
+        self.assertEqual(results[status_id].status_code, 404)
+
+    def test_set_member_interests_bulk_reports_each_member(self):
+
+        subscribed_email = self._get_fresh_email()
+        missing_email = self._get_fresh_email()
+
+        with self.recorder.use_cassette('{}_arrange'.format(self.id())):
+            self._api_subscribe_email_to_list(self.temp_list['id'], subscribed_email)
+            category = self._api_create_interest_category(self.temp_list['id'])
+            interest = self._api_create_interest(self.temp_list['id'], category['id'])
+
+        with self.recorder.use_cassette(self.id()):
+            results = self.mc.set_member_interests_bulk(self.temp_list['id'], {
+                subscribed_email: {interest['id']: True},
+                missing_email: {interest['id']: True}
+            })
+
+        self.assertEqual(results, {subscribed_email: True, missing_email: False})
+
+
+class SegmentTest(BaseMailChimpClientTest):
+
+    def test_update_tag_members_adds_and_removes_members(self):
+
+        emails = [self._get_fresh_email() for i in range(3)]
+
+        with self.recorder.use_cassette('{}_arrange'.format(self.id())):
+            for email in emails:
+                # subscribe an email address to the list (via API directly)
+                self._api_subscribe_email_to_list(self.temp_list['id'], email)
+
+        with self.recorder.use_cassette(self.id()):
+            added = self.mc.update_tag_members(self.temp_list['id'], 'tag', add=emails)
+            removed = self.mc.update_tag_members(
+                self.temp_list['id'], 'tag', remove=emails[:1])
+
+        self.assertEqual(added['added'], 3)
+        self.assertEqual(added['errors'], [])
+        self.assertEqual(removed['removed'], 1)
+
+    def test_add_emails_to_segment_reports_members_not_on_list(self):
+
+        with self.recorder.use_cassette(self.id()):
+            segment_id = self.mc.get_tag_id('segment', self.temp_list['id'])
+            report = self.mc.add_emails_to_segment(
+                [self._get_fresh_email()], self.temp_list['id'], segment_id)
+
+        self.assertEqual(report['added'], 0)
+        self.assertEqual(len(report['errors']), 1)
+
+
+class InterestIndexTest(BaseMailChimpClientTest):
+
+    def test_index_resolves_existing_interests_by_name(self):
+
+        with self.recorder.use_cassette('{}_arrange'.format(self.id())):
+            category = self._api_create_interest_category(self.temp_list['id'])
+            interest = self._api_create_interest(self.temp_list['id'], category['id'])
+
+        index = InterestIndex(self.mc, self.temp_list['id'])
+
+        with self.recorder.use_cassette(self.id()):
+            category_id = index.category_id(category['response'].json().get('title'))
+            interest_id = index.interest_id(
+                category['response'].json().get('title'), interest['name'])
+
+        self.assertEqual(category_id, category['id'])
+        self.assertEqual(interest_id, interest['id'])
+
+    def test_ensure_interest_creates_once(self):
+
+        category_title = self._get_guid()
+        interest_name = self._get_guid()
+        index = InterestIndex(self.mc, self.temp_list['id'])
+
+        with self.recorder.use_cassette(self.id()):
+            first_id = index.ensure_interest(category_title, interest_name)
+            second_id = index.ensure_interest(category_title, interest_name)
+
+        self.assertIsNotNone(first_id)
+        self.assertEqual(first_id, second_id)
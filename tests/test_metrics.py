@@ -0,0 +1,170 @@
+from unittest import TestCase
+
+from mailchimpy.batch import BatchJob
+from mailchimpy.fakeserver import FakeMailChimpServer
+from mailchimpy.mailchimpy import MailChimpClient
+from mailchimpy.metrics import RequestHooks, RequestMetrics
+from mailchimpy.retry import RetryPolicy
+
+
+class RecordingHooks(RequestHooks):
+
+    def __init__(self):
+
+        self.started = []
+        self.ended = []
+
+    def on_request_start(self, event):
+
+        self.started.append(dict(event))
+
+    def on_request_end(self, event):
+
+        self.ended.append(dict(event))
+
+
+def _end_event(endpoint='lists/{}/members/{}', method='GET', status_code=200,
+               elapsed=0.02, retries=0):
+
+    return {
+        'method': method, 'endpoint': endpoint, 'path': endpoint,
+        'status_code': status_code, 'bytes_sent': 10, 'bytes_received': 100,
+        'retries': retries, 'elapsed': elapsed, 'error': None
+    }
+
+
+class RequestHooksTest(TestCase):
+
+    def setUp(self):
+
+        self.server = FakeMailChimpServer().start()
+        self.hooks = RecordingHooks()
+        self.client = MailChimpClient(
+            'apikey-us1', api_root=self.server.api_root, hooks=[self.hooks],
+            retry_policy=RetryPolicy(max_retries=20, backoff_factor=0.001))
+
+    def tearDown(self):
+
+        self.server.stop()
+
+    def test_hooks_see_each_request(self):
+
+        self.client.subscribe_email_to_list('someone@example.com', 'list')
+        self.client.check_subscription_status('someone@example.com', 'list')
+
+        self.assertEqual(
+            [(event['method'], event['endpoint']) for event in self.hooks.started],
+            [('POST', 'lists/{}/members'), ('GET', 'lists/{}/members/{}')])
+        self.assertIsNone(self.hooks.started[0]['status_code'])
+
+        post, get = self.hooks.ended
+        self.assertEqual(post['status_code'], 200)
+        self.assertEqual(post['path'], 'lists/list/members')
+        self.assertGreater(post['bytes_sent'], 0)
+        self.assertGreater(post['bytes_received'], 0)
+        self.assertGreater(post['elapsed'], 0)
+        self.assertEqual(get['bytes_sent'], 0)
+        self.assertIsNone(get['error'])
+
+    def test_retries_are_reported(self):
+
+        self.server.error_rate = 0.5
+
+        for _ in range(10):
+            self.client.get_api_root()
+
+        self.assertEqual(
+            sum(event['retries'] for event in self.hooks.ended),
+            self.server.stats()['faults'])
+        self.assertTrue(all(event['status_code'] == 200 for event in self.hooks.ended))
+
+    def test_errors_are_reported(self):
+
+        self.server.stop()
+        self.client.retry_policy = RetryPolicy(max_retries=0)
+
+        with self.assertRaises(Exception):
+            self.client.get_api_root()
+
+        self.assertIsNone(self.hooks.ended[0]['status_code'])
+        self.assertIsNotNone(self.hooks.ended[0]['error'])
+
+        self.server = FakeMailChimpServer().start()
+
+    def test_batch_results_downloads_are_reported(self):
+
+        self.client.subscribe_email_to_list('someone@example.com', 'list')
+
+        job = BatchJob(self.client)
+        job.check_subscription_status('someone@example.com', 'list')
+        results = list(job.run(poll_interval=0))
+
+        self.assertEqual(results[0].response, {'status': 'subscribed'})
+
+        download = self.hooks.ended[-1]
+        self.assertEqual((download['method'], download['endpoint']), ('GET', 'batch-results'))
+        self.assertEqual(download['path'], 'batch-results')
+        self.assertEqual(download['status_code'], 200)
+        self.assertGreater(download['bytes_received'], 0)
+
+    def test_without_hooks(self):
+
+        client = MailChimpClient('apikey-us1', api_root=self.server.api_root)
+
+        self.assertTrue(client.subscribe_email_to_list('someone@example.com', 'list'))
+        self.assertEqual(self.hooks.ended, [])
+
+
+class RequestMetricsTest(TestCase):
+
+    def test_stats(self):
+
+        metrics = RequestMetrics()
+
+        for elapsed in [0.002] * 90 + [0.2] * 10:
+            metrics.on_request_start({})
+            metrics.on_request_end(_end_event(elapsed=elapsed))
+        metrics.on_request_start({})
+        metrics.on_request_end(_end_event('lists/{}', 'POST', None, 0.002, retries=3))
+
+        stats = metrics.stats()
+
+        self.assertEqual(
+            list(stats.keys()), [('GET', 'lists/{}/members/{}'), ('POST', 'lists/{}')])
+        get = stats[('GET', 'lists/{}/members/{}')]
+        self.assertEqual(get['requests'], 100)
+        self.assertLess(get['p50'], 0.005)
+        self.assertGreater(get['p95'], 0.1)
+        self.assertLessEqual(get['p95'], 0.25)
+        self.assertEqual(get['bytes_received'], 10000)
+        self.assertEqual(get['status_codes'], {200: 100})
+        self.assertEqual(stats[('POST', 'lists/{}')]['status_codes'], {'error': 1})
+        self.assertEqual(stats[('POST', 'lists/{}')]['retries'], 3)
+        self.assertEqual(metrics.in_flight, 0)
+
+    def test_prometheus(self):
+
+        metrics = RequestMetrics(buckets=(0.01, 0.1))
+
+        metrics.on_request_start({})
+        metrics.on_request_end(_end_event(elapsed=0.05))
+        metrics.on_request_start({})
+        metrics.on_request_end(_end_event(elapsed=1, status_code=404))
+        metrics.on_request_start({})
+
+        lines = metrics.prometheus().splitlines()
+
+        labels = 'method="GET",endpoint="lists/{}/members/{}"'
+        self.assertIn('mailchimpy_requests_in_flight 1', lines)
+        self.assertIn('# TYPE mailchimpy_request_duration_seconds histogram', lines)
+        self.assertIn('mailchimpy_requests_total{{{},status="200"}} 1'.format(labels), lines)
+        self.assertIn('mailchimpy_requests_total{{{},status="404"}} 1'.format(labels), lines)
+        self.assertIn(
+            'mailchimpy_request_duration_seconds_bucket{{{},le="0.01"}} 0'.format(labels), lines)
+        self.assertIn(
+            'mailchimpy_request_duration_seconds_bucket{{{},le="0.1"}} 1'.format(labels), lines)
+        self.assertIn(
+            'mailchimpy_request_duration_seconds_bucket{{{},le="+Inf"}} 2'.format(labels), lines)
+        self.assertIn('mailchimpy_request_duration_seconds_sum{{{}}} 1.05'.format(labels), lines)
+        self.assertIn('mailchimpy_request_duration_seconds_count{{{}}} 2'.format(labels), lines)
+        self.assertIn('mailchimpy_response_bytes_received_total{{{}}} 200'.format(labels), lines)
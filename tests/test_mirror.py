@@ -0,0 +1,113 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from mailchimpy.fakeserver import FakeMailChimpServer
+from mailchimpy.mailchimpy import MailChimpClient
+from mailchimpy.mirror import ListMirror
+
+
+class ListMirrorTest(TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.server = FakeMailChimpServer().start()
+        self.client = MailChimpClient('apikey-us1', api_root=self.server.api_root)
+        self.mirror = ListMirror(
+            self.client, 'list', os.path.join(self.directory.name, 'mirror.db'))
+
+    def tearDown(self):
+
+        self.mirror.close()
+        self.server.stop()
+        self.directory.cleanup()
+
+    def _set_member(self, email, status, last_changed):
+
+        # the fake api stamps changes with the current time, so set the
+        # time directly to control what each sync sees as changed
+        self.server.add_member('list', email, status)['last_changed'] = last_changed
+
+    def test_first_sync_loads_every_member(self):
+
+        self._set_member('a@example.com', 'subscribed', '2016-01-01T00:00:00+00:00')
+        self._set_member('b@example.com', 'unsubscribed', '2016-01-02T00:00:00+00:00')
+
+        self.assertEqual(self.mirror.sync(), 2)
+        self.assertEqual(len(self.mirror), 2)
+
+    def test_later_syncs_only_fetch_changed_members(self):
+
+        self._set_member('a@example.com', 'subscribed', '2016-01-01T00:00:00+00:00')
+        self._set_member('b@example.com', 'subscribed', '2015-12-01T00:00:00+00:00')
+        self.mirror.sync()
+
+        self._set_member('a@example.com', 'unsubscribed', '2016-01-03T00:00:00+00:00')
+
+        self.assertEqual(self.mirror.sync(), 1)
+        # the newest change is read again, as it is within the overlap
+        self.assertEqual(self.mirror.sync(), 1)
+        self.assertEqual(
+            self.mirror.check_subscription_status('a@example.com'), (True, False))
+        self.assertEqual(
+            self.mirror.check_subscription_status('b@example.com'), (True, True))
+
+    def test_changes_in_the_same_second_as_the_watermark_are_synced(self):
+
+        self._set_member('a@example.com', 'subscribed', '2016-01-01T00:00:00+00:00')
+        self._set_member('b@example.com', 'subscribed', '2016-01-01T00:00:00+00:00')
+        self.mirror.sync()
+
+        self._set_member('a@example.com', 'unsubscribed', '2016-01-01T00:00:00+00:00')
+        self.mirror.sync()
+
+        self.assertEqual(
+            self.mirror.check_subscription_status('a@example.com'), (True, False))
+
+    def test_changes_made_just_after_a_sync_are_synced(self):
+
+        # stamped by the fake api itself, most likely within the same second
+        self.server.add_member('list', 'a@example.com')
+        self.mirror.sync()
+
+        self.client.unsubscribe_email_from_list('a@example.com', 'list')
+        self.mirror.sync()
+
+        self.assertEqual(
+            self.mirror.check_subscription_status('a@example.com'),
+            self.client.check_subscription_status('a@example.com', 'list'))
+
+    def test_check_subscription_status_matches_client_semantics(self):
+
+        self._set_member('a@example.com', 'subscribed', '2016-01-01T00:00:00+00:00')
+        self._set_member('b@example.com', 'transactional', '2016-01-01T00:00:00+00:00')
+        self._set_member('c@example.com', 'archived', '2016-01-01T00:00:00+00:00')
+        self.mirror.sync()
+
+        for email in ['A@example.com', 'b@example.com', 'c@example.com', 'd@example.com']:
+            self.assertEqual(
+                self.mirror.check_subscription_status(email),
+                self.client.check_subscription_status(email, 'list'))
+
+        self.assertEqual(
+            self.mirror.check_subscription_status('A@example.com'), (True, True))
+        self.assertEqual(
+            self.mirror.check_subscription_status('b@example.com'), (True, False))
+        self.assertEqual(
+            self.mirror.check_subscription_status('d@example.com'), (False, None))
+
+    def test_check_subscription_status_syncs_when_stale(self):
+
+        self._set_member('a@example.com', 'subscribed', '2016-01-01T00:00:00+00:00')
+
+        self.assertEqual(
+            self.mirror.check_subscription_status('a@example.com', max_staleness=60),
+            (True, True))
+        self.assertEqual(self.server.stats()['requests'], 1)
+
+        # fresh enough, so answered without another sync
+        self.assertEqual(
+            self.mirror.check_subscription_status('a@example.com', max_staleness=60),
+            (True, True))
+        self.assertEqual(self.server.stats()['requests'], 1)
@@ -0,0 +1,124 @@
+import os
+import tempfile
+import threading
+from unittest import TestCase
+
+from mailchimpy.fakeserver import FakeMailChimpServer
+from mailchimpy.mailchimpy import MailChimpClient
+from mailchimpy.outbox import Outbox
+from mailchimpy.retry import RetryPolicy
+
+
+class OutboxTest(TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'outbox.db')
+        self.outbox = Outbox(self.path)
+
+        self.server = FakeMailChimpServer().start()
+        self.client = MailChimpClient(
+            'apikey-us1', api_root=self.server.api_root,
+            retry_policy=RetryPolicy(max_retries=2, backoff_factor=0.001))
+
+    def tearDown(self):
+
+        self.server.stop()
+        self.outbox.close()
+        self.directory.cleanup()
+
+    def test_writes_survive_reopening(self):
+
+        self.outbox.subscribe_email_to_list('a@example.com', 'list')
+        self.outbox.close()
+
+        self.outbox = Outbox(self.path)
+
+        self.assertEqual(len(self.outbox), 1)
+
+    def test_replay_sends_last_write_per_member_and_empties_outbox(self):
+
+        self.outbox.subscribe_email_to_list('a@example.com', 'list')
+        self.outbox.unsubscribe_email_from_list('a@example.com', 'list')
+        self.outbox.subscribe_email_to_list('b@example.com', 'list')
+
+        result = self.outbox.replay(self.client)
+
+        self.assertEqual(result, {'replayed': 3, 'errors': 0})
+        self.assertEqual(self.server.stats()['requests'], 1)
+        self.assertEqual(len(self.outbox), 0)
+        self.assertEqual(
+            self.client.check_subscription_status('a@example.com', 'list'), (True, False))
+        self.assertEqual(
+            self.client.check_subscription_status('b@example.com', 'list'), (True, True))
+
+    def test_replay_drops_writes_the_api_refuses_for_good(self):
+
+        self.outbox.subscribe_email_to_list('not an email', 'list')
+        self.outbox.subscribe_email_to_list('a@example.com', 'list')
+
+        result = self.outbox.replay(self.client)
+
+        self.assertEqual(result, {'replayed': 2, 'errors': 1})
+        self.assertEqual(len(self.outbox), 0)
+
+    def test_writes_to_a_deleted_list_do_not_block_the_outbox(self):
+
+        self.outbox.subscribe_email_to_list('a@example.com', 'gone')
+        self.outbox.subscribe_email_to_list('b@example.com', 'list')
+        self.server.delete_list('gone')
+
+        result = self.outbox.replay(self.client)
+
+        self.assertEqual(result, {'replayed': 2, 'errors': 1})
+        self.assertEqual(len(self.outbox), 0)
+        # refused for good, so not retried
+        self.assertEqual(self.server.stats()['requests'], 2)
+        self.assertEqual(
+            self.client.check_subscription_status('b@example.com', 'list'), (True, True))
+
+    def test_rejected_replay_keeps_writes(self):
+
+        self.outbox.subscribe_email_to_list('a@example.com', 'list')
+        self.server.error_rate = 1.0
+
+        with self.assertRaises(Exception):
+            self.outbox.replay(self.client)
+
+        self.assertEqual(len(self.outbox), 1)
+        # the upsert was retried
+        self.assertEqual(self.server.stats()['faults'], 3)
+
+        self.server.error_rate = 0.0
+
+        self.assertEqual(self.outbox.replay(self.client), {'replayed': 1, 'errors': 0})
+        self.assertEqual(
+            self.client.check_subscription_status('a@example.com', 'list'), (True, True))
+
+    def test_failed_replay_keeps_writes(self):
+
+        self.outbox.subscribe_email_to_list('a@example.com', 'list')
+        self.server.stop()
+
+        with self.assertRaises(Exception):
+            self.outbox.replay(self.client)
+
+        self.assertEqual(len(self.outbox), 1)
+
+        self.server = FakeMailChimpServer().start()
+
+    def test_concurrent_writers_share_commits(self):
+
+        def write(i):
+            for j in range(50):
+                self.outbox.subscribe_email_to_list('{}-{}@example.com'.format(i, j), 'list')
+
+        writers = [threading.Thread(target=write, args=(i,)) for i in range(8)]
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join()
+
+        self.assertEqual(len(self.outbox), 400)
+        self.assertLessEqual(self.outbox.commits, 400)
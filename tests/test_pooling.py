@@ -0,0 +1,53 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+import requests
+
+from mailchimpy.fakeserver import FakeMailChimpServer
+from mailchimpy.mailchimpy import MailChimpClient
+from mailchimpy.retry import RetryPolicy
+
+
+class ConnectionPoolTest(TestCase):
+
+    def setUp(self):
+
+        self.server = FakeMailChimpServer().start()
+
+    def tearDown(self):
+
+        self.server.stop()
+
+    def test_connections_are_reused(self):
+
+        client = MailChimpClient('apikey-us1', api_root=self.server.api_root)
+
+        for _ in range(5):
+            client.get_api_root()
+
+        self.assertEqual(list(client.pool_stats().values()), [
+            {'connections': 1, 'requests': 5, 'idle': 1, 'maxsize': 10}
+        ])
+
+    def test_pool_is_shared_between_threads(self):
+
+        client = MailChimpClient(
+            'apikey-us1', api_root=self.server.api_root, pool_maxsize=4, pool_block=True)
+
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(lambda _: client.get_api_root(), range(40)))
+
+        stats = list(client.pool_stats().values())[0]
+        self.assertLessEqual(stats['connections'], 4)
+        self.assertEqual(stats['requests'], 40)
+        self.assertEqual(stats['idle'], stats['connections'])
+
+    def test_read_timeout_is_applied(self):
+
+        self.server.latency = lambda: 0.5
+        client = MailChimpClient(
+            'apikey-us1', api_root=self.server.api_root, read_timeout=0.1,
+            retry_policy=RetryPolicy(max_retries=0))
+
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            client.get_api_root()
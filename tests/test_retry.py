@@ -0,0 +1,124 @@
+import time
+from unittest import TestCase
+
+import requests
+
+from mailchimpy.fakeserver import FakeMailChimpServer
+from mailchimpy.mailchimpy import MailChimpClient
+from mailchimpy.retry import RetryPolicy
+
+
+class RetryPolicyTest(TestCase):
+
+    def _response(self, status_code, headers=None):
+
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers.update(headers or {})
+        return response
+
+    def test_too_many_requests_is_retried_for_any_method(self):
+
+        policy = RetryPolicy()
+
+        self.assertTrue(policy.is_retryable(False, self._response(429)))
+
+    def test_server_errors_are_only_retried_when_idempotent(self):
+
+        policy = RetryPolicy()
+
+        self.assertTrue(policy.is_retryable(True, self._response(503)))
+        self.assertFalse(policy.is_retryable(False, self._response(503)))
+
+    def test_client_errors_are_not_retried(self):
+
+        policy = RetryPolicy()
+
+        self.assertFalse(policy.is_retryable(True, self._response(400)))
+        self.assertFalse(policy.is_retryable(True, self._response(404)))
+
+    def test_delay_honours_retry_after(self):
+
+        policy = RetryPolicy()
+
+        self.assertEqual(
+            policy.delay(0, self._response(429, {'Retry-After': '7'})), 7)
+
+    def test_retry_after_is_capped_at_max_backoff(self):
+
+        policy = RetryPolicy(max_backoff=5)
+
+        self.assertEqual(
+            policy.delay(0, self._response(429, {'Retry-After': '86400'})), 5)
+
+    def test_delay_is_jittered_within_backoff_window(self):
+
+        policy = RetryPolicy(backoff_factor=1, max_backoff=5)
+
+        for retries in range(6):
+            delay = policy.delay(retries)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(5, 2 ** retries))
+
+    def test_retries_stop_at_max_retries(self):
+
+        policy = RetryPolicy(max_retries=2)
+
+        self.assertTrue(policy.consume(0))
+        self.assertTrue(policy.consume(1))
+        self.assertFalse(policy.consume(2))
+
+    def test_retries_stop_when_budget_is_spent(self):
+
+        policy = RetryPolicy(retry_budget=2)
+
+        self.assertTrue(policy.consume(0))
+        self.assertTrue(policy.consume(0))
+        self.assertFalse(policy.consume(0))
+        self.assertEqual(policy.retries_remaining, 0)
+
+
+class ClientRetryTest(TestCase):
+
+    def setUp(self):
+
+        self.server = FakeMailChimpServer(error_rate=1.0).start()
+
+    def tearDown(self):
+
+        self.server.stop()
+
+    def _client(self, **kwargs):
+
+        return MailChimpClient(
+            'apikey-us1', api_root=self.server.api_root,
+            retry_policy=RetryPolicy(max_retries=2, **kwargs))
+
+    def test_server_errors_are_retried(self):
+
+        client = self._client(backoff_factor=0.001)
+
+        self.assertEqual(client.get_api_root().status_code, 503)
+        self.assertEqual(self.server.stats()['faults'], 3)
+
+        self.server.error_rate = 0.0
+
+        self.assertEqual(client.get_api_root().status_code, 200)
+        self.assertEqual(self.server.stats()['requests'], 4)
+
+    def test_server_errors_are_not_retried_for_posts(self):
+
+        self.assertIsNone(
+            self._client(backoff_factor=0.001).subscribe_email_to_list('a@example.com', 'list'))
+        self.assertEqual(self.server.stats()['requests'], 1)
+
+    def test_retry_after_is_capped_at_max_backoff(self):
+
+        self.server.retry_after = 3600
+        client = self._client(max_backoff=0.01)
+
+        started = time.time()
+        client.get_api_root()
+
+        self.assertEqual(self.server.stats()['requests'], 3)
+        self.assertLess(time.time() - started, 1)
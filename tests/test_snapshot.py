@@ -0,0 +1,82 @@
+import hashlib
+import os
+import tempfile
+from unittest import TestCase
+
+from mailchimpy.snapshot import Snapshot, write_snapshot
+
+
+class SnapshotTest(TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'list.snapshot')
+
+    def tearDown(self):
+
+        self.directory.cleanup()
+
+    def _hash(self, email):
+
+        return hashlib.md5(email.encode()).hexdigest()
+
+    def test_lookups_find_every_member(self):
+
+        emails = ['{}@example.com'.format(i) for i in range(1000)]
+        write_snapshot(
+            self.path,
+            ((self._hash(email), 'subscribed' if i % 2 else 'unsubscribed')
+             for i, email in enumerate(emails)))
+
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(len(snapshot), 1000)
+            for i, email in enumerate(emails):
+                self.assertEqual(
+                    snapshot.check_subscription_status(email), (True, bool(i % 2)))
+
+    def test_lookup_of_missing_email(self):
+
+        write_snapshot(self.path, [(self._hash('a@example.com'), 'subscribed')])
+
+        with Snapshot(self.path) as snapshot:
+            self.assertNotIn('b@example.com', snapshot)
+            self.assertIsNone(snapshot.status('b@example.com'))
+            self.assertEqual(
+                snapshot.check_subscription_status('b@example.com'), (False, None))
+
+    def test_lookups_ignore_email_case(self):
+
+        write_snapshot(self.path, [(self._hash('a@example.com'), 'cleaned')])
+
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(snapshot.status('A@Example.com'), 'cleaned')
+
+    def test_transactional_and_archived_members_are_not_subscribed(self):
+
+        write_snapshot(self.path, [
+            (self._hash('a@example.com'), 'transactional'),
+            (self._hash('b@example.com'), 'archived')
+        ])
+
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(
+                snapshot.check_subscription_status('a@example.com'), (True, False))
+            self.assertEqual(
+                snapshot.check_subscription_status('b@example.com'), (True, False))
+
+    def test_empty_snapshot(self):
+
+        write_snapshot(self.path, [])
+
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(len(snapshot), 0)
+            self.assertNotIn('a@example.com', snapshot)
+
+    def test_file_size_is_seventeen_bytes_per_member(self):
+
+        write_snapshot(
+            self.path,
+            ((self._hash('{}@example.com'.format(i)), 'subscribed') for i in range(100)))
+
+        self.assertEqual(os.path.getsize(self.path), 16 + 100 * 17)
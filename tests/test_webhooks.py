@@ -0,0 +1,150 @@
+import asyncio
+import threading
+from unittest import TestCase
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+import requests
+
+from mailchimpy.webhooks import AsyncWebhookApp, StatusTable, WebhookApp, WebhookEvent
+
+
+class QuietHandler(WSGIRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+
+class WebhookAppTest(TestCase):
+
+    def setUp(self):
+
+        self.table = StatusTable()
+        self.server = make_server(
+            '127.0.0.1', 0, WebhookApp(self.table, secret='s3cret'),
+            handler_class=QuietHandler)
+        self.url = 'http://127.0.0.1:{}/?secret=s3cret'.format(self.server.server_port)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _post(self, data, url=None):
+
+        return requests.post(url or self.url, data=data)
+
+    def test_get_validates_webhook_url(self):
+
+        self.assertEqual(requests.get(self.url).status_code, 200)
+
+    def test_requests_without_secret_are_forbidden(self):
+
+        response = self._post(
+            {'type': 'subscribe', 'data[list_id]': 'list', 'data[email]': 'a@example.com'},
+            url=self.url.split('?')[0])
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_malformed_events_are_rejected(self):
+
+        self.assertEqual(self._post({'type': 'subscribe'}).status_code, 400)
+
+    def test_unknown_member_has_no_status(self):
+
+        self.assertIsNone(self.table.check_subscription_status('a@example.com', 'list'))
+
+    def test_subscribe_then_unsubscribe(self):
+
+        self._post({'type': 'subscribe', 'data[list_id]': 'list', 'data[email]': 'a@example.com'})
+        self.assertEqual(
+            self.table.check_subscription_status('a@example.com', 'list'), (True, True))
+
+        self._post({
+            'type': 'unsubscribe', 'data[list_id]': 'list',
+            'data[email]': 'a@example.com', 'data[action]': 'unsub'})
+        self.assertEqual(
+            self.table.check_subscription_status('a@example.com', 'list'), (True, False))
+
+    def test_unsubscribe_with_delete_action_removes_member(self):
+
+        self._post({
+            'type': 'unsubscribe', 'data[list_id]': 'list',
+            'data[email]': 'a@example.com', 'data[action]': 'delete'})
+
+        self.assertEqual(
+            self.table.check_subscription_status('a@example.com', 'list'), (False, None))
+
+    def test_cleaned(self):
+
+        self._post({'type': 'cleaned', 'data[list_id]': 'list', 'data[email]': 'a@example.com'})
+
+        self.assertEqual(
+            self.table.check_subscription_status('a@example.com', 'list'), (True, False))
+
+    def test_upemail_moves_status_to_new_address(self):
+
+        self._post({'type': 'subscribe', 'data[list_id]': 'list', 'data[email]': 'a@example.com'})
+        self._post({
+            'type': 'upemail', 'data[list_id]': 'list',
+            'data[old_email]': 'a@example.com', 'data[new_email]': 'b@example.com'})
+
+        self.assertEqual(
+            self.table.check_subscription_status('a@example.com', 'list'), (False, None))
+        self.assertEqual(
+            self.table.check_subscription_status('b@example.com', 'list'), (True, True))
+
+    def test_upemail_without_new_email_is_rejected(self):
+
+        self._post({'type': 'subscribe', 'data[list_id]': 'list', 'data[email]': 'a@example.com'})
+        response = self._post({
+            'type': 'upemail', 'data[list_id]': 'list', 'data[old_email]': 'a@example.com'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            self.table.check_subscription_status('a@example.com', 'list'), (True, True))
+
+    def test_upemail_changing_only_case_keeps_status(self):
+
+        self._post({'type': 'subscribe', 'data[list_id]': 'list', 'data[email]': 'a@example.com'})
+        self._post({
+            'type': 'upemail', 'data[list_id]': 'list',
+            'data[old_email]': 'a@example.com', 'data[new_email]': 'A@example.com'})
+
+        self.assertEqual(
+            self.table.check_subscription_status('a@example.com', 'list'), (True, True))
+
+    def test_bad_upemail_event_leaves_table_unchanged(self):
+
+        table = StatusTable()
+        table.queue(WebhookEvent('subscribe', 'list', 'a@example.com', None, None, None))
+        table.apply_pending()
+        table.queue(WebhookEvent('upemail', 'list', 'a@example.com', None, None, None))
+
+        with self.assertRaises(AttributeError):
+            table.apply_pending()
+
+        self.assertEqual(table.check_subscription_status('a@example.com', 'list'), (True, True))
+
+
+class AsyncWebhookAppTest(TestCase):
+
+    def test_asgi_app_queues_events(self):
+
+        table = StatusTable()
+        app = AsyncWebhookApp(table)
+        sent = []
+
+        async def receive():
+            return {
+                'type': 'http.request',
+                'body': b'type=subscribe&data%5Blist_id%5D=list&data%5Bemail%5D=a%40example.com'
+            }
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(app({'type': 'http', 'method': 'POST', 'query_string': b''}, receive, send))
+
+        self.assertEqual(sent[0]['status'], 200)
+        self.assertEqual(table.check_subscription_status('a@example.com', 'list'), (True, True))
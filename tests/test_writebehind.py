@@ -0,0 +1,197 @@
+import time
+from unittest import TestCase
+
+from mailchimpy.fakeserver import FakeMailChimpServer
+from mailchimpy.mailchimpy import MailChimpClient
+from mailchimpy.retry import RetryPolicy
+from mailchimpy.writebehind import WriteBehindQueue
+
+
+class WriteBehindQueueTest(TestCase):
+
+    def setUp(self):
+
+        self.server = FakeMailChimpServer().start()
+        self.client = MailChimpClient(
+            'apikey-us1', api_root=self.server.api_root,
+            retry_policy=RetryPolicy(max_retries=0))
+
+    def tearDown(self):
+
+        self.server.stop()
+
+    def _wait_for_requests(self, requests):
+
+        deadline = time.time() + 5
+        while self.server.stats()['requests'] < requests and time.time() < deadline:
+            time.sleep(0.01)
+
+    def test_repeated_writes_for_a_member_are_coalesced(self):
+
+        queue = WriteBehindQueue(self.client, flush_interval=60)
+        queue.subscribe_email_to_list('a@example.com', 'list')
+        queue.unsubscribe_email_from_list('A@example.com', 'list')
+
+        self.assertEqual(queue.depth, 1)
+        self.assertEqual(queue.stats()['coalesced'], 1)
+
+        queue.drain()
+
+        self.assertEqual(self.server.stats()['requests'], 1)
+        self.assertEqual(
+            self.client.check_subscription_status('a@example.com', 'list'), (True, False))
+
+    def test_flush_sends_one_batch_per_list(self):
+
+        queue = WriteBehindQueue(self.client, flush_interval=60)
+        queue.subscribe_email_to_list('a@example.com', 'list1')
+        queue.subscribe_email_to_list('b@example.com', 'list2')
+        queue.subscribe_email_to_list('c@example.com', 'list1')
+        queue.flush()
+
+        self.assertEqual(self.server.stats()['requests'], 2)
+        self.assertEqual(queue.depth, 0)
+        self.assertEqual(queue.stats()['flushed'], 3)
+        self.assertEqual(
+            self.client.check_subscription_status('b@example.com', 'list2'), (True, True))
+
+        queue.drain()
+
+    def test_rejected_writes_are_requeued(self):
+
+        queue = WriteBehindQueue(self.client, flush_interval=60)
+        queue.subscribe_email_to_list('a@example.com', 'list')
+        self.server.error_rate = 1.0
+
+        with self.assertRaises(Exception):
+            queue.flush()
+
+        self.assertEqual(queue.depth, 1)
+        self.assertEqual(queue.stats()['flushed'], 0)
+
+        self.server.error_rate = 0.0
+        queue.drain()
+
+        self.assertEqual(queue.stats()['flushed'], 1)
+        self.assertEqual(
+            self.client.check_subscription_status('a@example.com', 'list'), (True, True))
+
+    def test_requeued_writes_do_not_replace_newer_ones(self):
+
+        queue = WriteBehindQueue(self.client, flush_interval=60)
+        queue.subscribe_email_to_list('a@example.com', 'list')
+        self.server.error_rate = 1.0
+
+        # the newer write arrives while the older one is being sent
+        set_subscriptions = self.client.set_subscriptions
+
+        def unsubscribe_during_flush(subscriptions, list_id):
+            queue.unsubscribe_email_from_list('a@example.com', 'list')
+            return set_subscriptions(subscriptions, list_id)
+
+        self.client.set_subscriptions = unsubscribe_during_flush
+
+        with self.assertRaises(Exception):
+            queue.flush()
+
+        self.client.set_subscriptions = set_subscriptions
+        self.server.error_rate = 0.0
+        queue.drain()
+
+        self.assertEqual(
+            self.client.check_subscription_status('a@example.com', 'list'), (True, False))
+
+    def test_writes_to_a_deleted_list_are_not_requeued(self):
+
+        queue = WriteBehindQueue(self.client, flush_interval=60)
+        queue.subscribe_email_to_list('a@example.com', 'gone')
+        queue.subscribe_email_to_list('b@example.com', 'list')
+        self.server.delete_list('gone')
+
+        queue.flush()
+
+        self.assertEqual(queue.depth, 0)
+        self.assertEqual(queue.stats()['flushed'], 2)
+        self.assertEqual(queue.stats()['errors'], 1)
+        self.assertEqual(
+            self.client.check_subscription_status('b@example.com', 'list'), (True, True))
+
+        queue.drain()
+
+    def test_writes_are_given_up_on_after_max_attempts(self):
+
+        queue = WriteBehindQueue(self.client, flush_interval=60, max_attempts=3)
+        queue.subscribe_email_to_list('a@example.com', 'list')
+        self.server.error_rate = 1.0
+
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                queue.flush()
+            self.assertEqual(queue.depth, 1)
+
+        with self.assertRaises(Exception):
+            queue.flush()
+
+        self.assertEqual(queue.depth, 0)
+        self.assertEqual(queue.stats()['errors'], 1)
+
+        queue.drain()
+
+    def test_failed_flushes_back_off(self):
+
+        # a full batch which keeps failing is re-queued full, but mustn't
+        # be sent again until the interval has passed
+        queue = WriteBehindQueue(self.client, max_batch_size=2, flush_interval=0.2)
+        self.server.error_rate = 1.0
+        queue.subscribe_email_to_list('a@example.com', 'list')
+        queue.subscribe_email_to_list('b@example.com', 'list')
+
+        time.sleep(0.5)
+
+        self.assertLessEqual(self.server.stats()['requests'], 4)
+
+        self.server.error_rate = 0.0
+        queue.drain()
+
+        self.assertEqual(
+            self.client.check_subscription_status('a@example.com', 'list'), (True, True))
+
+    def test_invalid_addresses_are_counted_as_errors(self):
+
+        queue = WriteBehindQueue(self.client, flush_interval=60)
+        queue.subscribe_email_to_list('not an email', 'list')
+        queue.drain()
+
+        self.assertEqual(queue.stats()['errors'], 1)
+        self.assertEqual(queue.depth, 0)
+
+    def test_queue_flushes_when_full(self):
+
+        queue = WriteBehindQueue(self.client, max_batch_size=2, flush_interval=60)
+        queue.subscribe_email_to_list('a@example.com', 'list')
+        queue.subscribe_email_to_list('b@example.com', 'list')
+
+        self._wait_for_requests(1)
+
+        self.assertEqual(self.server.stats()['requests'], 1)
+
+        queue.drain()
+
+    def test_queue_flushes_after_interval(self):
+
+        queue = WriteBehindQueue(self.client, flush_interval=0.05)
+        queue.subscribe_email_to_list('a@example.com', 'list')
+
+        time.sleep(0.2)
+
+        self.assertEqual(self.server.stats()['requests'], 1)
+
+        queue.drain()
+
+    def test_writes_are_refused_once_drained(self):
+
+        queue = WriteBehindQueue(self.client)
+        queue.drain()
+
+        with self.assertRaises(Exception):
+            queue.subscribe_email_to_list('a@example.com', 'list')